@@ -0,0 +1,339 @@
+"""
+Crystal Activity Journal - Persistent Segmented Activity History
+Copyright © 2025 Ervin Remus Radosavlevici
+Official Owner: Ervin Remus Radosavlevici
+Contact: radosavlevici210@icloud.com
+Append-only binary journal with memory-mapped reads and a sparse
+timestamp index for range queries
+
+Layout of each segment (activity-NNNNNN.journal):
+    b"CRJ1" header, then records of <float64 epoch><uint16 length><utf-8 message>
+Each segment has a sidecar .idx file of <float64 epoch><uint64 offset>
+pairs for every index_interval-th record.
+
+Stored timestamps never decrease, across segments too: a record older than
+the one before it (e.g. after the wall clock steps back) is stored with the
+previous record's timestamp, so range queries stay a binary search.
+
+A journal directory belongs to one process: opening it takes an exclusive
+flock on its .lock file, and a second process opening the same directory
+gets RuntimeError instead of interleaving writes with the first.
+"""
+
+import os
+import mmap
+import fcntl
+import struct
+import bisect
+import threading
+from typing import Iterable, List, Optional, Tuple
+
+MAGIC = b"CRJ1"
+RECORD_HEADER = struct.Struct("<dH")
+INDEX_ENTRY = struct.Struct("<dQ")
+MAX_MESSAGE_BYTES = 0xFFFF
+SEGMENT_SUFFIX = ".journal"
+LOCK_NAME = ".lock"
+
+
+class _Segment:
+    """One journal file with its sparse index"""
+
+    def __init__(self, directory: str, number: int):
+        self.number = number
+        self.path = os.path.join(directory, f"activity-{number:06d}{SEGMENT_SUFFIX}")
+        self.index_path = self.path[:-len(SEGMENT_SUFFIX)] + ".idx"
+        self.index_ts: List[float] = []
+        self.index_off: List[int] = []
+        self.size = len(MAGIC)
+        self.records = 0
+        self.first_ts: Optional[float] = None
+        self.last_ts: Optional[float] = None
+        self._map = None
+        self._map_size = 0
+
+    def create(self):
+        """Start an empty segment on disk"""
+        with open(self.path, "wb") as f:
+            f.write(MAGIC)
+        open(self.index_path, "wb").close()
+
+    def recover(self, index_interval: int):
+        """Load the index and validate the record tail after a restart"""
+        with open(self.path, "rb") as f:
+            data = f.read()
+        if not data.startswith(MAGIC):
+            raise ValueError(f"{self.path} is not an activity journal segment")
+
+        index_ts, index_off = [], []
+        if os.path.exists(self.index_path):
+            with open(self.index_path, "rb") as f:
+                raw = f.read()
+            usable = len(raw) - len(raw) % INDEX_ENTRY.size
+            for ts, offset in INDEX_ENTRY.iter_unpack(raw[:usable]):
+                if offset >= len(data):
+                    break
+                index_ts.append(ts)
+                index_off.append(offset)
+
+        # Rebuild the index from the last trusted entry onwards
+        offset = index_off[-1] if index_off else len(MAGIC)
+        records = (len(index_off) - 1) * index_interval if index_off else 0
+        if index_off:
+            index_ts.pop()
+            index_off.pop()
+
+        last_ts = None
+        while offset + RECORD_HEADER.size <= len(data):
+            ts, length = RECORD_HEADER.unpack_from(data, offset)
+            end = offset + RECORD_HEADER.size + length
+            if end > len(data):
+                break
+            if records % index_interval == 0:
+                index_ts.append(ts)
+                index_off.append(offset)
+            records += 1
+            last_ts = ts
+            offset = end
+
+        if offset != len(data):
+            with open(self.path, "r+b") as f:
+                f.truncate(offset)
+        with open(self.index_path, "wb") as f:
+            f.write(b"".join(INDEX_ENTRY.pack(ts, off) for ts, off in zip(index_ts, index_off)))
+
+        self.index_ts, self.index_off = index_ts, index_off
+        self.size = offset
+        self.records = records
+        self.first_ts = index_ts[0] if index_ts else None
+        self.last_ts = last_ts
+
+    def view(self):
+        """Memory map covering everything written so far"""
+        if self._map is None or self._map_size != self.size:
+            if self._map is not None:
+                self._map.close()
+            with open(self.path, "rb") as f:
+                self._map = mmap.mmap(f.fileno(), self.size, access=mmap.ACCESS_READ)
+            self._map_size = self.size
+        return self._map
+
+    def close(self):
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+
+    def decode(self, start: int, end: int) -> List[Tuple[float, str]]:
+        """Decode the records between two record boundaries"""
+        data = self.view()
+        records = []
+        offset = start
+        while offset < end:
+            ts, length = RECORD_HEADER.unpack_from(data, offset)
+            body = offset + RECORD_HEADER.size
+            records.append((ts, data[body:body + length].decode("utf-8", "replace")))
+            offset = body + length
+        return records
+
+    def block_bounds(self, block: int) -> Tuple[int, int]:
+        """Byte range of the index block starting at index entry block"""
+        end = self.index_off[block + 1] if block + 1 < len(self.index_off) else self.size
+        return self.index_off[block], end
+
+
+class ActivityJournal:
+    """Append-only, segmented on-disk journal of activity messages"""
+
+    def __init__(self, directory: str, segment_bytes: int = 64 << 20,
+                 index_interval: int = 64, max_segments: Optional[int] = None):
+        self.directory = directory
+        self.segment_bytes = segment_bytes
+        self.index_interval = index_interval
+        self.max_segments = max_segments
+        self._lock = threading.Lock()
+        self._segments: List[_Segment] = []
+
+        os.makedirs(directory, exist_ok=True)
+        self._lock_fd = os.open(os.path.join(directory, LOCK_NAME), os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            fcntl.flock(self._lock_fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            os.close(self._lock_fd)
+            raise RuntimeError(f"activity journal {directory} is already open in another process") from None
+        self._pid = os.getpid()
+
+        numbers = sorted(
+            int(name[len("activity-"):-len(SEGMENT_SUFFIX)])
+            for name in os.listdir(directory)
+            if name.startswith("activity-") and name.endswith(SEGMENT_SUFFIX)
+        )
+        for number in numbers:
+            segment = _Segment(directory, number)
+            segment.recover(index_interval)
+            self._segments.append(segment)
+        if not self._segments:
+            self._start_segment(1)
+        self._last_ts = next(
+            (segment.last_ts for segment in reversed(self._segments) if segment.last_ts is not None), None
+        )
+
+        self._open_writers()
+
+    def append(self, timestamp: float, message: str):
+        """Append one record"""
+        self.append_many([(timestamp, message)])
+
+    def append_many(self, records: Iterable[Tuple[float, str]]):
+        """Append records in order and flush them to the OS
+
+        A timestamp lower than the last stored one is clamped up to it.
+        """
+        if os.getpid() != self._pid:
+            # A forked child shares the parent's flock, so check the owner here
+            raise RuntimeError(f"activity journal {self.directory} belongs to process {self._pid}")
+        with self._lock:
+            segment = self._segments[-1]
+            for timestamp, message in records:
+                body = message.encode("utf-8")[:MAX_MESSAGE_BYTES]
+                record_size = RECORD_HEADER.size + len(body)
+                if segment.records and segment.size + record_size > self.segment_bytes:
+                    self._flush()
+                    segment = self._rotate()
+
+                # Keep timestamps non-decreasing so the sparse index stays sorted
+                if self._last_ts is not None and timestamp < self._last_ts:
+                    timestamp = self._last_ts
+
+                if segment.records % self.index_interval == 0:
+                    segment.index_ts.append(timestamp)
+                    segment.index_off.append(segment.size)
+                    self._index_file.write(INDEX_ENTRY.pack(timestamp, segment.size))
+                    if segment.first_ts is None:
+                        segment.first_ts = timestamp
+
+                self._data_file.write(RECORD_HEADER.pack(timestamp, len(body)))
+                self._data_file.write(body)
+                segment.size += record_size
+                segment.records += 1
+                segment.last_ts = timestamp
+                self._last_ts = timestamp
+            self._flush()
+
+    def query(self, since: Optional[float] = None, until: Optional[float] = None,
+              limit: Optional[int] = None) -> List[Tuple[float, str]]:
+        """Records with since <= timestamp <= until, oldest first
+
+        With since set, the first limit matches are returned; otherwise the
+        most recent limit matches up to until.
+        """
+        if limit is not None and limit <= 0:
+            return []
+        with self._lock:
+            if since is None and limit is not None:
+                return self._query_backward(until, limit)
+            return self._query_forward(since, until, limit)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return sum(segment.records for segment in self._segments)
+
+    def close(self):
+        """Close writers and memory maps"""
+        with self._lock:
+            self._data_file.close()
+            self._index_file.close()
+            for segment in self._segments:
+                segment.close()
+            if self._lock_fd >= 0:
+                os.close(self._lock_fd)  # releases the flock
+                self._lock_fd = -1
+
+    def _query_forward(self, since, until, limit) -> List[Tuple[float, str]]:
+        results: List[Tuple[float, str]] = []
+        for segment in self._segments:
+            if not segment.index_ts:
+                continue
+            if since is not None and segment.last_ts < since:
+                continue
+            if until is not None and segment.first_ts > until:
+                break
+
+            block = 0
+            if since is not None:
+                block = max(bisect.bisect_left(segment.index_ts, since) - 1, 0)
+
+            for block in range(block, len(segment.index_off)):
+                if until is not None and segment.index_ts[block] > until:
+                    return results
+                start, end = segment.block_bounds(block)
+                for ts, message in segment.decode(start, end):
+                    if since is not None and ts < since:
+                        continue
+                    if until is not None and ts > until:
+                        return results
+                    results.append((ts, message))
+                    if limit is not None and len(results) >= limit:
+                        return results
+        return results
+
+    def _query_backward(self, until, limit) -> List[Tuple[float, str]]:
+        collected: List[List[Tuple[float, str]]] = []
+        remaining = limit
+        for segment in reversed(self._segments):
+            if not segment.index_ts:
+                continue
+            if until is not None and segment.first_ts > until:
+                continue
+
+            last_block = len(segment.index_off) - 1
+            if until is not None:
+                last_block = bisect.bisect_right(segment.index_ts, until) - 1
+
+            for block in range(last_block, -1, -1):
+                start, end = segment.block_bounds(block)
+                records = segment.decode(start, end)
+                if until is not None:
+                    records = [record for record in records if record[0] <= until]
+                if len(records) > remaining:
+                    records = records[-remaining:]
+                collected.append(records)
+                remaining -= len(records)
+                if remaining <= 0:
+                    break
+            if remaining <= 0:
+                break
+
+        results = []
+        for records in reversed(collected):
+            results.extend(records)
+        return results
+
+    def _start_segment(self, number: int) -> _Segment:
+        segment = _Segment(self.directory, number)
+        segment.create()
+        self._segments.append(segment)
+        return segment
+
+    def _open_writers(self):
+        segment = self._segments[-1]
+        self._data_file = open(segment.path, "ab")
+        self._index_file = open(segment.index_path, "ab")
+
+    def _rotate(self) -> _Segment:
+        """Close the active segment and start the next one"""
+        self._data_file.close()
+        self._index_file.close()
+        segment = self._start_segment(self._segments[-1].number + 1)
+        self._open_writers()
+
+        if self.max_segments is not None:
+            while len(self._segments) > self.max_segments:
+                oldest = self._segments.pop(0)
+                oldest.close()
+                os.remove(oldest.path)
+                os.remove(oldest.index_path)
+        return segment
+
+    def _flush(self):
+        self._data_file.flush()
+        self._index_file.flush()
@@ -0,0 +1,307 @@
+"""
+Crystal Activity Log - Ring Buffer and Concurrent Producer Log
+Copyright © 2025 Ervin Remus Radosavlevici
+Official Owner: Ervin Remus Radosavlevici
+Contact: radosavlevici210@icloud.com
+O(1) append, copy-free views, lock-free per-thread logging and compact
+activity records
+"""
+
+import time
+import heapq
+import itertools
+import threading
+from collections import deque
+from collections.abc import Sequence
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterator, List, Optional, Union
+
+DEFAULT_CAPACITY = 1000
+MESSAGE_TABLE_CAPACITY = 4096
+
+
+class MessageTable:
+    """Bounded intern table mapping repeated messages to small integer ids
+
+    Once full, intern() returns the message itself so unbounded sets of
+    distinct messages cannot grow the table.
+    """
+
+    def __init__(self, capacity: int = MESSAGE_TABLE_CAPACITY):
+        self.capacity = capacity
+        self.messages: List[str] = []
+        self._ids: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def intern(self, message: str) -> Union[int, str]:
+        """Id for message, or message itself when the table is full"""
+        message_id = self._ids.get(message)
+        if message_id is not None:
+            return message_id
+        with self._lock:
+            message_id = self._ids.get(message)
+            if message_id is None:
+                if len(self.messages) >= self.capacity:
+                    return message
+                message_id = len(self.messages)
+                # Publish the message before its id becomes visible
+                self.messages.append(message)
+                self._ids[message] = message_id
+            return message_id
+
+    def lookup(self, message_id: Union[int, str]) -> str:
+        """Message for an id returned by intern()"""
+        return message_id if message_id.__class__ is str else self.messages[message_id]
+
+    def __len__(self) -> int:
+        return len(self.messages)
+
+
+MESSAGE_TABLE = MessageTable()
+
+
+class ActivityRecord:
+    """Activity entry holding an epoch timestamp and an interned message"""
+
+    __slots__ = ("timestamp", "_message")
+
+    def __init__(self, timestamp: float, message: str):
+        self.timestamp = timestamp
+        self._message = MESSAGE_TABLE.intern(message)
+
+    @property
+    def message(self) -> str:
+        return MESSAGE_TABLE.lookup(self._message)
+
+    def isoformat(self) -> str:
+        """Local-time ISO 8601 timestamp"""
+        return datetime.fromtimestamp(self.timestamp).isoformat()
+
+    def to_dict(self) -> Dict[str, str]:
+        """Serializable form with an ISO timestamp"""
+        return {"timestamp": self.isoformat(), "message": self.message}
+
+    def __repr__(self) -> str:
+        return f"ActivityRecord({self.timestamp!r}, {self.message!r})"
+
+
+class RingBuffer:
+    """Fixed-capacity buffer that overwrites its oldest entry when full"""
+
+    __slots__ = ("capacity", "_items", "_start", "_size")
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY):
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        self.capacity = capacity
+        self._items: List[Any] = [None] * capacity
+        self._start = 0
+        self._size = 0
+
+    def append(self, item: Any):
+        """Add an entry, dropping the oldest one when the buffer is full"""
+        if self._size < self.capacity:
+            self._items[(self._start + self._size) % self.capacity] = item
+            self._size += 1
+        else:
+            self._items[self._start] = item
+            self._start = (self._start + 1) % self.capacity
+
+    def extend(self, items):
+        """Append several entries in order"""
+        for item in items:
+            self.append(item)
+
+    def clear(self):
+        """Remove every entry"""
+        self._items = [None] * self.capacity
+        self._start = 0
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self.tail(self._size))
+
+    def tail(self, n: int) -> "RingView":
+        """View of the last n entries, oldest first, without copying"""
+        n = max(0, min(n, self._size))
+        return RingView(self, self._size - n, n)
+
+    def _get(self, index: int) -> Any:
+        """Entry at a logical index, 0 being the oldest"""
+        return self._items[(self._start + index) % self.capacity]
+
+
+class RingView(Sequence):
+    """Read-only window onto a RingBuffer
+
+    A view reads through to the buffer, so it reflects later overwrites;
+    materialise it with list() when a stable snapshot is needed.
+    """
+
+    __slots__ = ("_ring", "_offset", "_length")
+
+    def __init__(self, ring: RingBuffer, offset: int, length: int):
+        self._ring = ring
+        self._offset = offset
+        self._length = length
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._length))]
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("ring view index out of range")
+        return self._ring._get(self._offset + index)
+
+    def __iter__(self) -> Iterator[Any]:
+        ring = self._ring
+        for index in range(self._offset, self._offset + self._length):
+            yield ring._get(index)
+
+    def __repr__(self) -> str:
+        return f"RingView({list(self)!r})"
+
+
+class ConcurrentActivityLog:
+    """Activity log safe for many producer threads without a hot-path lock
+
+    Each producer thread appends (sequence, entry) pairs to its own deque;
+    deque.append/popleft are atomic in CPython, so producers never block
+    each other. A merge step drains every thread buffer and merges them by
+    sequence number into the shared ring. Only merges and reads take the
+    merge lock.
+
+    Sequence numbers are taken just before the buffered append, so two
+    entries logged in the same instant by different threads may be merged
+    in either order; each thread's own entries always keep their order.
+
+    An optional sink receives every merged batch in order, e.g. to persist
+    it; max_delay bounds how long an entry may sit in a thread buffer
+    before a producer triggers a merge.
+    """
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY, merge_threshold: int = 256,
+                 sink: Optional[Callable[[List[Any]], None]] = None,
+                 max_delay: Optional[float] = None):
+        self.ring = RingBuffer(capacity)
+        self.merge_threshold = merge_threshold
+        self.sink = sink
+        self.max_delay = max_delay
+        self._last_merge = time.monotonic()
+        self._sequence = itertools.count()
+        self._local = threading.local()
+        self._buffers: List[Any] = []  # (owner thread, deque) pairs
+        self._registry_lock = threading.Lock()
+        self._merge_lock = threading.Lock()
+
+    @property
+    def capacity(self) -> int:
+        return self.ring.capacity
+
+    def append(self, entry: Any):
+        """Buffer an entry on the calling thread"""
+        buffer = getattr(self._local, "buffer", None)
+        if buffer is None:
+            buffer = self._register_buffer()
+        buffer.append((next(self._sequence), entry))
+
+        pending = len(buffer)
+        if pending >= self.merge_threshold:
+            # Opportunistic merge; block only if this thread is far behind
+            self.merge(blocking=pending >= 4 * self.merge_threshold)
+        elif self.max_delay is not None and time.monotonic() - self._last_merge >= self.max_delay:
+            self.merge(blocking=False)
+
+    def extend(self, entries: List[Any]):
+        """Buffer several entries on the calling thread in one step"""
+        buffer = getattr(self._local, "buffer", None)
+        if buffer is None:
+            buffer = self._register_buffer()
+        sequence = self._sequence
+        buffer.extend([(next(sequence), entry) for entry in entries])
+
+        pending = len(buffer)
+        if pending >= self.merge_threshold:
+            self.merge(blocking=pending >= 4 * self.merge_threshold)
+        elif self.max_delay is not None and time.monotonic() - self._last_merge >= self.max_delay:
+            self.merge(blocking=False)
+
+    def merge(self, blocking: bool = True) -> bool:
+        """Move buffered entries into the shared ring in sequence order"""
+        if not self._merge_lock.acquire(blocking):
+            return False
+        try:
+            self._merge_locked()
+        finally:
+            self._merge_lock.release()
+        return True
+
+    def snapshot(self, limit: int) -> List[Any]:
+        """Consistent copy of the last limit entries, oldest first"""
+        with self._merge_lock:
+            self._merge_locked()
+            return list(self.ring.tail(limit))
+
+    def view(self, limit: int) -> RingView:
+        """Copy-free view of the last limit entries
+
+        The view reads through to the ring and may observe later merges.
+        """
+        self.merge()
+        return self.ring.tail(limit)
+
+    def __len__(self) -> int:
+        self.merge()
+        return len(self.ring)
+
+    def _register_buffer(self) -> deque:
+        """Create and register the calling thread's producer buffer"""
+        buffer = deque()
+        self._local.buffer = buffer
+        with self._registry_lock:
+            self._buffers.append((threading.current_thread(), buffer))
+        return buffer
+
+    def _merge_locked(self):
+        """Drain all producer buffers; caller holds the merge lock"""
+        self._last_merge = time.monotonic()
+        with self._registry_lock:
+            registered = list(self._buffers)
+
+        batches = []
+        finished = []
+        for owner, buffer in registered:
+            batch = []
+            try:
+                while True:
+                    batch.append(buffer.popleft())
+            except IndexError:
+                pass
+            if batch:
+                batches.append(batch)
+            if not owner.is_alive() and not buffer:
+                finished.append((owner, buffer))
+
+        if finished:
+            finished_ids = {id(buffer) for _, buffer in finished}
+            with self._registry_lock:
+                self._buffers = [pair for pair in self._buffers if id(pair[1]) not in finished_ids]
+
+        if not batches:
+            return
+        merged = batches[0] if len(batches) == 1 else heapq.merge(*batches)
+        self._consume(merged)
+
+    def _consume(self, merged):
+        """Store merged (sequence, entry) pairs in the ring and the sink"""
+        entries = [entry for _, entry in merged]
+        self.ring.extend(entries)
+        if self.sink is not None:
+            self.sink(entries)
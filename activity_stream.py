@@ -0,0 +1,253 @@
+"""
+Crystal Activity Stream - Server-Sent Events for Live Activity Tailing
+Copyright © 2025 Ervin Remus Radosavlevici
+Official Owner: Ervin Remus Radosavlevici
+Contact: radosavlevici210@icloud.com
+Pushes new activity entries to SSE subscribers without polling
+
+Entries are encoded once into a bounded shared history; each subscriber
+only keeps a cursor (the last event id it has sent). A subscriber that
+falls further behind than the history receives a "lagged" event and
+continues from the oldest retained entry.
+
+Event ids are supplied by the publisher so they can be global: the shared
+ring sequence across workers, or the journal record count across
+restarts. A client resuming with Last-Event-ID on another worker or after
+a restart then continues from the same point in the activity history.
+"""
+
+import threading
+from collections import deque
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from status_serializer import dumps
+
+STREAM_PATH = "/api/crystal/activity/stream"
+KEEPALIVE_SECONDS = 15.0
+MAX_EVENTS_PER_WRITE = 100
+SSE_HEADERS = [
+    ("Content-Type", "text/event-stream; charset=utf-8"),
+    ("Cache-Control", "no-cache"),
+    ("X-Accel-Buffering", "no")
+]
+
+
+def format_event(event_id: int, data: bytes, event: str = "activity") -> bytes:
+    """One SSE message"""
+    return b"id: %d\nevent: %s\ndata: %s\n\n" % (event_id, event.encode("ascii"), data)
+
+
+KEEPALIVE = b": keepalive\n\n"
+
+
+class ActivityBroadcaster:
+    """Bounded history of encoded activity events with blocking and async waits"""
+
+    def __init__(self, history: int = 1000, last_id: int = 0):
+        self._history: deque = deque(maxlen=history)  # (event id, encoded entry), ids increasing
+        self._last_id = last_id
+        self._condition = threading.Condition()
+        self._loop_events: Dict[Any, Any] = {}  # event loop -> asyncio.Event
+        self.subscribers = 0
+
+    @property
+    def last_id(self) -> int:
+        return self._last_id
+
+    def publish(self, entries: List[Dict[str, Any]], ids: Optional[Iterable[int]] = None):
+        """Encode entries once and wake every waiting subscriber
+
+        ids are the entries' event ids, increasing; by default they follow
+        on from the last id. Entries whose id was already published are
+        skipped.
+        """
+        if not entries:
+            return
+        with self._condition:
+            if ids is None:
+                ids = range(self._last_id + 1, self._last_id + 1 + len(entries))
+            published = False
+            for event_id, entry in zip(ids, entries):
+                if event_id <= self._last_id:
+                    continue
+                self._history.append((event_id, dumps(entry)))
+                self._last_id = event_id
+                published = True
+            if not published:
+                return
+            self._condition.notify_all()
+            loops = list(self._loop_events)
+        for loop in loops:
+            try:
+                loop.call_soon_threadsafe(self._wake_loop, loop)
+            except RuntimeError:  # loop closed
+                self._loop_events.pop(loop, None)
+
+    def start_cursor(self, last_event_id: Optional[str] = None, backlog: int = 0) -> int:
+        """Cursor for a new subscriber
+
+        Resumes after last_event_id when it is still meaningful, otherwise
+        starts backlog entries before the newest one.
+        """
+        with self._condition:
+            if last_event_id:
+                try:
+                    cursor = int(last_event_id)
+                except ValueError:
+                    cursor = None
+                if cursor is not None and 0 <= cursor <= self._last_id:
+                    return cursor
+            return max(0, self._last_id - max(0, backlog))
+
+    def events_after(self, cursor: int, limit: int = MAX_EVENTS_PER_WRITE) -> Tuple[List[Tuple[int, bytes]], int]:
+        """Up to limit events newer than cursor and how many were lost to lag"""
+        with self._condition:
+            if cursor >= self._last_id:
+                return [], 0
+            history = self._history
+            # Ids may have gaps (entries the publisher never saw), so search
+            low, high = 0, len(history)
+            while low < high:
+                middle = (low + high) // 2
+                if history[middle][0] <= cursor:
+                    low = middle + 1
+                else:
+                    high = middle
+            events = [history[i] for i in range(low, min(len(history), low + limit))]
+            skipped = events[0][0] - cursor - 1 if events else 0
+            return events, skipped
+
+    def wait(self, cursor: int, timeout: float) -> bool:
+        """Block until an event newer than cursor exists or timeout passes"""
+        with self._condition:
+            return self._condition.wait_for(lambda: self._last_id > cursor, timeout)
+
+    async def wait_async(self, cursor: int, timeout: float) -> bool:
+        """Await an event newer than cursor without holding a thread"""
+        import asyncio
+
+        loop = asyncio.get_running_loop()
+        event = self._loop_events.get(loop)
+        if event is None:
+            event = self._loop_events.setdefault(loop, asyncio.Event())
+        if self._last_id > cursor:
+            return True
+        try:
+            await asyncio.wait_for(event.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        return self._last_id > cursor
+
+    def _wake_loop(self, loop):
+        """Release every waiter on loop and arm a fresh event for the next wait"""
+        import asyncio
+
+        event = self._loop_events.get(loop)
+        if event is not None:
+            self._loop_events[loop] = asyncio.Event()
+            event.set()
+
+    def subscribe(self):
+        with self._condition:
+            self.subscribers += 1
+
+    def unsubscribe(self):
+        with self._condition:
+            self.subscribers -= 1
+
+    def _batch(self, cursor: int) -> Tuple[bytes, int]:
+        """Encoded SSE messages after cursor and the new cursor"""
+        events, skipped = self.events_after(cursor)
+        parts = []
+        if skipped:
+            parts.append(format_event(cursor + skipped, dumps({"skipped": skipped}), "lagged"))
+        for event_id, data in events:
+            parts.append(format_event(event_id, data))
+            cursor = event_id
+        return b"".join(parts), cursor
+
+
+def iter_sse(broadcaster: ActivityBroadcaster, cursor: int,
+             keepalive: float = KEEPALIVE_SECONDS) -> Iterator[bytes]:
+    """Blocking SSE body for WSGI servers; holds one thread per subscriber"""
+    broadcaster.subscribe()
+    try:
+        yield b"retry: 3000\n\n"
+        while True:
+            body, cursor = broadcaster._batch(cursor)
+            if body:
+                yield body
+            elif not broadcaster.wait(cursor, keepalive):
+                yield KEEPALIVE
+    finally:
+        broadcaster.unsubscribe()
+
+
+class ActivityStreamASGI:
+    """ASGI wrapper serving the activity stream natively and everything else via app"""
+
+    def __init__(self, app, get_broadcaster, path: str = STREAM_PATH):
+        self.app = app
+        self.get_broadcaster = get_broadcaster
+        self.path = path
+
+    async def __call__(self, scope, receive, send):
+        import asyncio
+
+        if scope["type"] != "http" or scope["path"] != self.path or scope["method"] != "GET":
+            await self.app(scope, receive, send)
+            return
+
+        broadcaster = self.get_broadcaster()
+        headers = dict(scope.get("headers") or [])
+        query = _parse_query(scope.get("query_string", b""))
+        cursor = broadcaster.start_cursor(
+            headers.get(b"last-event-id", b"").decode("latin-1") or query.get("last_event_id"),
+            _int(query.get("backlog"))
+        )
+
+        await send({
+            "type": "http.response.start",
+            "status": 200,
+            "headers": [(name.lower().encode("latin-1"), value.encode("latin-1")) for name, value in SSE_HEADERS]
+        })
+
+        async def wait_for_disconnect():
+            while (await receive())["type"] != "http.disconnect":
+                pass
+
+        disconnect = asyncio.ensure_future(wait_for_disconnect())
+        broadcaster.subscribe()
+        try:
+            await send({"type": "http.response.body", "body": b"retry: 3000\n\n", "more_body": True})
+            while True:
+                body, cursor = broadcaster._batch(cursor)
+                if body:
+                    await send({"type": "http.response.body", "body": body, "more_body": True})
+                    continue
+                # Park until an event, a keepalive timeout or the client leaving
+                waiter = asyncio.ensure_future(broadcaster.wait_async(cursor, KEEPALIVE_SECONDS))
+                await asyncio.wait({waiter, disconnect}, return_when=asyncio.FIRST_COMPLETED)
+                if disconnect.done():
+                    waiter.cancel()
+                    return
+                if not waiter.result():
+                    await send({"type": "http.response.body", "body": KEEPALIVE, "more_body": True})
+        except OSError:
+            pass
+        finally:
+            broadcaster.unsubscribe()
+            disconnect.cancel()
+
+
+def _parse_query(query_string: bytes) -> Dict[str, str]:
+    from urllib.parse import parse_qsl
+
+    return dict(parse_qsl(query_string.decode("latin-1")))
+
+
+def _int(value: Optional[str]) -> int:
+    try:
+        return int(value) if value else 0
+    except ValueError:
+        return 0
@@ -16,27 +16,45 @@ import os
 import json
 import hashlib
 import datetime
-import requests
-import subprocess
 import logging
-from typing import Dict, List, Any
+import threading
+from typing import TYPE_CHECKING, Dict, List, Any, Optional
 from functools import wraps
 import time
 
-# Configure security logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - SECURITY - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('security_protection.log'),
-        logging.StreamHandler()
-    ]
-)
+# copyright_scanner, merkle_proofs and threat_matcher are imported by the
+# methods that use them, keeping this module cheap to import
+if TYPE_CHECKING:
+    from merkle_proofs import RepositoryMerkleTree
+    from threat_matcher import ThreatMatcher
+
+_logging_configured = False
+_logging_lock = threading.Lock()
+
+def _configure_security_logging():
+    """Configure security logging on first use rather than at import"""
+    global _logging_configured
+    if _logging_configured:
+        return
+    
+    with _logging_lock:
+        if not _logging_configured:
+            logging.basicConfig(
+                level=logging.INFO,
+                format='%(asctime)s - SECURITY - %(levelname)s - %(message)s',
+                handlers=[
+                    logging.FileHandler('security_protection.log', delay=True),
+                    logging.StreamHandler()
+                ]
+            )
+            _logging_configured = True
 
 class AntiTheftSecuritySystem:
     """Advanced anti-theft and security protection system"""
     
     def __init__(self):
+        _configure_security_logging()
+        
         self.owner_email = "radosavlevici210@icloud.com"
         self.owner_name = "Ervin Remus Radosavlevici"
         self.github_username = "radosavlevici210"
@@ -48,6 +66,11 @@ class AntiTheftSecuritySystem:
         ]
         self.security_config = self._load_security_config()
         self.threat_signatures = self._initialize_threat_signatures()
+        self._threat_matcher = None
+        # Directory holding local checkouts of protected_repositories
+        self.repository_root = os.environ.get("CRYSTAL_REPOSITORY_ROOT")
+        self._copyright_scanner = None
+        self._merkle_tree = None
         
     def _load_security_config(self):
         """Load security configuration"""
@@ -126,6 +149,7 @@ class AntiTheftSecuritySystem:
     def _protect_repositories(self):
         """Protect all repositories with anti-theft measures"""
         protected_repos = []
+        audits = self.audit_copyright_notices() if self.repository_root else {}
         
         for repo in self.protected_repositories:
             repo_protection = {
@@ -141,6 +165,8 @@ class AntiTheftSecuritySystem:
                 "owner_verified": True,
                 "contact": self.owner_email
             }
+            if repo in audits:
+                repo_protection["copyright_audit"] = audits[repo]
             protected_repos.append(repo_protection)
             
         return {
@@ -150,6 +176,45 @@ class AntiTheftSecuritySystem:
             "status": "ACTIVE"
         }
     
+    def audit_copyright_notices(self, repository_root: str = None) -> Dict[str, Any]:
+        """Check the copyright notice of every source file in local checkouts
+        
+        Returns one report per protected repository found under
+        repository_root; unchanged files are answered from the scan cache.
+        """
+        root = repository_root or self.repository_root
+        if not root:
+            return {}
+        checkouts = {
+            repo: os.path.abspath(os.path.join(root, repo))
+            for repo in self.protected_repositories
+            if os.path.isdir(os.path.join(root, repo))
+        }
+        if not checkouts:
+            return {}
+        if self._copyright_scanner is None:
+            from copyright_scanner import CopyrightScanner
+            self._copyright_scanner = CopyrightScanner(notice=f"Copyright © 2025 {self.owner_name}")
+        report = self._copyright_scanner.scan(list(checkouts.values()))
+        
+        audits = {}
+        for repo, path in checkouts.items():
+            prefix = os.path.join(path, "")
+            missing = [f for f in report["missing_notice"] if f.startswith(prefix)]
+            altered = [f for f in report["altered_notice"] if f.startswith(prefix)]
+            audits[repo] = {
+                "checkout": path,
+                "missing_notice": missing,
+                "altered_notice": altered,
+                "compliant": not (missing or altered)
+            }
+            if missing or altered:
+                logging.warning(f"SECURITY ALERT: {repo} has {len(missing)} files without and "
+                                f"{len(altered)} files with an altered copyright notice")
+        logging.info(f"SECURITY: Copyright audit of {report['files_scanned']} files "
+                     f"({report['files_read']} read) in {report['elapsed_seconds']}s")
+        return audits
+    
     def _secure_account(self):
         """Implement account security measures"""
         security_measures = {
@@ -226,6 +291,15 @@ class AntiTheftSecuritySystem:
         
         return legal_protection
     
+    def _get_threat_matcher(self) -> "ThreatMatcher":
+        """Threat signatures compiled into one automaton, rebuilt when they change"""
+        from threat_matcher import ThreatMatcher
+        
+        key = ThreatMatcher.signature_key(self.threat_signatures)
+        if self._threat_matcher is None or self._threat_matcher.key != key:
+            self._threat_matcher = ThreatMatcher(self.threat_signatures)
+        return self._threat_matcher
+    
     def detect_theft_attempts(self, suspicious_activity=None):
         """Detect and respond to theft attempts"""
         threat_analysis = {
@@ -235,27 +309,18 @@ class AntiTheftSecuritySystem:
             "recommended_actions": []
         }
         
-        # Check for common theft patterns
-        if suspicious_activity:
-            for pattern in self.threat_signatures["suspicious_patterns"]:
-                if pattern.lower() in str(suspicious_activity).lower():
-                    threat_analysis["detected_threats"].append({
-                        "threat_type": pattern,
-                        "severity": "HIGH",
-                        "detection_time": datetime.datetime.now().isoformat(),
-                        "recommended_action": "Immediate investigation required"
-                    })
-        
-        # Check for scammer indicators
+        # One pass over the input finds every signature
         if suspicious_activity:
-            for indicator in self.threat_signatures["scammer_indicators"]:
-                if indicator.lower() in str(suspicious_activity).lower():
-                    threat_analysis["detected_threats"].append({
-                        "threat_type": indicator,
-                        "severity": "CRITICAL",
-                        "detection_time": datetime.datetime.now().isoformat(),
-                        "recommended_action": "Block and report immediately"
-                    })
+            from threat_matcher import THREAT_CATEGORIES
+            detection_time = datetime.datetime.now().isoformat()
+            for category, signature in self._get_threat_matcher().match(str(suspicious_activity)):
+                response = THREAT_CATEGORIES[category]
+                threat_analysis["detected_threats"].append({
+                    "threat_type": signature,
+                    "severity": response["severity"],
+                    "detection_time": detection_time,
+                    "recommended_action": response["recommended_action"]
+                })
         
         if threat_analysis["detected_threats"]:
             threat_analysis["threat_level"] = "CRITICAL"
@@ -264,6 +329,22 @@ class AntiTheftSecuritySystem:
         
         return threat_analysis
     
+    def scan_for_theft_attempts(self, source, chunk_size: Optional[int] = None):
+        """Stream detections from a file path, file object or chunk iterable
+        
+        Uses the same signatures and severities as detect_theft_attempts but
+        reports every occurrence with its byte offset, in constant memory.
+        """
+        from threat_matcher import DEFAULT_CHUNK_SIZE
+        
+        chunk_size = chunk_size or DEFAULT_CHUNK_SIZE
+        detections = 0
+        for detection in self._get_threat_matcher().scan_stream(source, chunk_size):
+            detections += 1
+            yield detection
+        if detections:
+            logging.warning(f"THREAT DETECTED: {detections} threat occurrences found in stream")
+    
     def generate_ownership_proof(self):
         """Generate cryptographic proof of ownership"""
         ownership_data = {
@@ -288,6 +369,59 @@ class AntiTheftSecuritySystem:
         
         return proof
     
+    def _get_merkle_tree(self) -> "RepositoryMerkleTree":
+        """Merkle tree over the local checkouts, brought up to date"""
+        from merkle_proofs import RepositoryMerkleTree
+        
+        if not self.repository_root:
+            raise ValueError("CRYSTAL_REPOSITORY_ROOT is not configured")
+        checkouts = {
+            repo: os.path.join(self.repository_root, repo)
+            for repo in self.protected_repositories
+            if os.path.isdir(os.path.join(self.repository_root, repo))
+        }
+        if self._merkle_tree is None or self._merkle_tree.repositories != {
+                repo: os.path.abspath(path) for repo, path in checkouts.items()}:
+            self._merkle_tree = RepositoryMerkleTree(checkouts)
+        self._merkle_tree.update()
+        return self._merkle_tree
+    
+    def generate_repository_ownership_proof(self):
+        """Ownership proof signed over the Merkle root of all repository files"""
+        tree = self._get_merkle_tree()
+        ownership_data = {
+            "owner": self.owner_name,
+            "email": self.owner_email,
+            "github": self.github_username,
+            "timestamp": datetime.datetime.now().isoformat(),
+            "repositories": sorted(tree.repositories),
+            "merkle_root": tree.root,
+            "tree_size": len(tree)
+        }
+        
+        ownership_string = json.dumps(ownership_data, sort_keys=True)
+        ownership_hash = hashlib.sha256(ownership_string.encode()).hexdigest()
+        
+        return {
+            "ownership_data": ownership_data,
+            "digital_signature": ownership_hash,
+            "verification_method": "SHA-256 cryptographic hash over an RFC 6962 Merkle root",
+            "legal_status": "Official ownership documentation",
+            "contact_verification": self.owner_email
+        }
+    
+    def prove_file_ownership(self, path: str):
+        """Inclusion proof for "<repository>/<relative path>" under a signed root"""
+        from merkle_proofs import verify_inclusion
+        
+        ownership_proof = self.generate_repository_ownership_proof()
+        inclusion_proof = self._merkle_tree.prove(path)
+        return {
+            "inclusion_proof": inclusion_proof,
+            "ownership_proof": ownership_proof,
+            "verified": verify_inclusion(inclusion_proof, ownership_proof["ownership_data"]["merkle_root"])
+        }
+    
     def create_anti_theft_notice(self):
         """Create comprehensive anti-theft notice for repositories"""
         notice = f"""
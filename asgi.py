@@ -0,0 +1,33 @@
+"""
+ASGI Entry Point - Crystal Computer Web Applications
+Copyright © 2025 Ervin Remus Radosavlevici
+Contact: radosavlevici210@icloud.com
+ORCID: 0009-0000-9787-510X
+Runs the same Flask routes on an event loop server
+
+    uvicorn asgi:application --workers 4 --timeout-graceful-shutdown 20
+    gunicorn asgi:application -k uvicorn.workers.UvicornWorker
+
+Connections, request bodies and response writes are handled by the event
+loop, so slow or idle clients no longer hold a worker process. Views still
+run synchronously on a bounded thread pool (CRYSTAL_ASGI_THREADS), except
+the activity SSE stream, which is served on the loop itself so idle
+subscribers cost no thread. Open streams never finish on their own, so
+give the server a graceful shutdown timeout.
+"""
+
+import os
+
+from a2wsgi import WSGIMiddleware
+
+from activity_stream import ActivityStreamASGI
+from crystal_computer_integration import get_crystal_computer_system
+from wsgi import application as wsgi_application
+
+application = ActivityStreamASGI(
+    WSGIMiddleware(
+        wsgi_application,
+        workers=int(os.environ.get("CRYSTAL_ASGI_THREADS", "16"))
+    ),
+    lambda: get_crystal_computer_system().get_activity_stream()
+)
@@ -0,0 +1,81 @@
+"""
+Activity Record Memory Benchmark
+Copyright © 2025 Ervin Remus Radosavlevici
+Contact: radosavlevici210@icloud.com
+Measures with tracemalloc the memory held by a full activity ring of the
+legacy three-key dict entries versus slotted ActivityRecord entries
+
+    python benchmarks/bench_activity_memory.py --entries 100000
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import tracemalloc
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from activity_log import ActivityRecord, RingBuffer
+
+MESSAGES = [
+    "Quantum coherence maintained at optimal levels",
+    "Neural electrodes (15750) functioning perfectly",
+    "Crystal resonance frequency stable",
+    "Divine connection signal strength: Maximum",
+    "Transcendent mode operations proceeding smoothly",
+    "God mode capabilities standing by",
+    "Reality control systems nominal",
+    "Consciousness expansion protocols active",
+    "Universal power flow: Unlimited",
+    "Quantum security barriers: Impenetrable"
+]
+
+
+def legacy_entry(i: int):
+    return {
+        "timestamp": datetime.now().isoformat(),
+        "message": MESSAGES[i % len(MESSAGES)],
+        "system": "Crystal Computer Ultimate"
+    }
+
+
+def record_entry(i: int):
+    return ActivityRecord(time.time(), MESSAGES[i % len(MESSAGES)])
+
+
+def measure(make_entry, entries: int) -> int:
+    """Bytes still allocated after filling a ring with entries"""
+    tracemalloc.start()
+    try:
+        ring = RingBuffer(entries)
+        baseline = tracemalloc.get_traced_memory()[0]
+        for i in range(entries):
+            ring.append(make_entry(i))
+        return tracemalloc.get_traced_memory()[0] - baseline
+    finally:
+        tracemalloc.stop()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare activity entry memory footprints")
+    parser.add_argument("--entries", type=int, default=100000)
+    args = parser.parse_args(argv)
+
+    legacy = measure(legacy_entry, args.entries)
+    records = measure(record_entry, args.entries)
+
+    print(json.dumps({
+        "entries": args.entries,
+        "legacy_dict_bytes": legacy,
+        "activity_record_bytes": records,
+        "legacy_bytes_per_entry": round(legacy / args.entries, 1),
+        "record_bytes_per_entry": round(records / args.entries, 1),
+        "reduction_percent": round((1 - records / legacy) * 100, 1)
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""
+ASGI vs WSGI Serving Benchmark
+Copyright © 2025 Ervin Remus Radosavlevici
+Contact: radosavlevici210@icloud.com
+Compares requests/sec and p99 latency of the sync gunicorn setup against
+the ASGI entry point, optionally with idle slow clients holding sockets
+
+    python benchmarks/bench_asgi_vs_wsgi.py --workers 2 --concurrency 32 --slow-clients 8
+"""
+
+import os
+import sys
+import json
+import time
+import socket
+import argparse
+import subprocess
+import http.client
+from typing import Dict, List, Any
+
+from load_test import drive_load
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DEFAULT_ROUTES = [
+    "/status",
+    "/api/crystal/production/status",
+    "/crystal-production"
+]
+
+SERVERS = {
+    "wsgi-gunicorn-sync": lambda port, workers: [
+        sys.executable, "-m", "gunicorn", "wsgi:application",
+        "--bind", f"127.0.0.1:{port}", "--workers", str(workers),
+        "--worker-class", "sync", "--log-level", "warning"
+    ],
+    "asgi-uvicorn": lambda port, workers: [
+        sys.executable, "-m", "uvicorn", "asgi:application",
+        "--host", "127.0.0.1", "--port", str(port), "--workers", str(workers),
+        "--log-level", "warning"
+    ]
+}
+
+
+def free_port() -> int:
+    """Ask the OS for an unused localhost port"""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_until_ready(port: int, timeout: float = 30.0):
+    """Poll the server until it answers a request"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=1)
+            conn.request("GET", "/api/crystal/production/status")
+            conn.getresponse().read()
+            conn.close()
+            return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f"Server on port {port} did not become ready")
+
+
+def open_slow_clients(port: int, count: int) -> List[socket.socket]:
+    """Open connections that send a partial request and then go idle"""
+    sockets = []
+    for _ in range(count):
+        sock = socket.create_connection(("127.0.0.1", port))
+        sock.sendall(b"GET /status HTTP/1.1\r\nHost: localhost\r\n")
+        sockets.append(sock)
+    return sockets
+
+
+def run_server_benchmark(name: str, args) -> Dict[str, Any]:
+    """Start one server, load it and shut it down"""
+    port = free_port()
+    process = subprocess.Popen(
+        SERVERS[name](port, args.workers),
+        cwd=REPO_ROOT,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL
+    )
+    slow_clients = []
+    try:
+        wait_until_ready(port)
+        slow_clients = open_slow_clients(port, args.slow_clients)
+        drive_load(port, args.routes, args.concurrency, args.warmup)
+        return drive_load(port, args.routes, args.concurrency, args.duration)
+    finally:
+        for sock in slow_clients:
+            sock.close()
+        process.terminate()
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare sync gunicorn with the ASGI entry point")
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--warmup", type=float, default=2.0)
+    parser.add_argument("--slow-clients", type=int, default=0,
+                        help="idle connections holding a partial request during the run")
+    parser.add_argument("--routes", nargs="+", default=DEFAULT_ROUTES)
+    parser.add_argument("--servers", nargs="+", choices=sorted(SERVERS), default=sorted(SERVERS, reverse=True))
+    args = parser.parse_args(argv)
+
+    results = {
+        "workers": args.workers,
+        "concurrency": args.concurrency,
+        "slow_clients": args.slow_clients,
+        "routes": args.routes,
+        "servers": {name: run_server_benchmark(name, args) for name in args.servers}
+    }
+    print(json.dumps(results, indent=2, sort_keys=True))
+    return results
+
+
+if __name__ == "__main__":
+    main()
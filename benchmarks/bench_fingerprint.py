@@ -0,0 +1,83 @@
+"""
+Bulk Fingerprint Throughput Benchmark
+Copyright © 2025 Ervin Remus Radosavlevici
+Contact: radosavlevici210@icloud.com
+Reports SHA-256 fingerprinting throughput in MB/s for each thread count
+over a generated set of files (page cache warm after the first pass)
+
+    python benchmarks/bench_fingerprint.py --files 2000 --file-size 262144 --threads 1 2 4 8
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bulk_fingerprint import DEFAULT_BUFFER_SIZE, fingerprint_files
+
+
+def create_files(directory: str, count: int, size: int):
+    block = os.urandom(min(size, 1 << 20))
+    paths = []
+    for i in range(count):
+        path = os.path.join(directory, f"file-{i:06d}.bin")
+        with open(path, "wb") as f:
+            remaining = size
+            while remaining:
+                f.write(block[:remaining])
+                remaining -= min(remaining, len(block))
+        paths.append(path)
+    return paths
+
+
+def measure(paths, threads: int, buffer_size: int) -> float:
+    """Seconds to fingerprint every path"""
+    started = time.perf_counter()
+    for result in fingerprint_files(paths, threads, buffer_size):
+        if "error" in result:
+            raise RuntimeError(result["error"])
+    return time.perf_counter() - started
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure bulk fingerprinting MB/s against thread count")
+    parser.add_argument("--files", type=int, default=2000)
+    parser.add_argument("--file-size", type=int, default=256 << 10)
+    parser.add_argument("--buffer-size", type=int, default=DEFAULT_BUFFER_SIZE)
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--directory", help="existing directory to generate files in")
+    args = parser.parse_args(argv)
+
+    directory = tempfile.mkdtemp(prefix="crystal-fingerprint-", dir=args.directory)
+    try:
+        paths = create_files(directory, args.files, args.file_size)
+        total_mb = args.files * args.file_size / 1e6
+        measure(paths, max(args.threads), args.buffer_size)  # warm the page cache
+
+        results = []
+        for threads in args.threads:
+            elapsed = measure(paths, threads, args.buffer_size)
+            results.append({
+                "threads": threads,
+                "seconds": round(elapsed, 3),
+                "mb_per_second": round(total_mb / elapsed, 1)
+            })
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+    print(json.dumps({
+        "files": args.files,
+        "file_size": args.file_size,
+        "total_mb": round(total_mb, 1),
+        "cpu_count": os.cpu_count(),
+        "results": results
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Import-Time Budget Check
+Copyright © 2025 Ervin Remus Radosavlevici
+Contact: radosavlevici210@icloud.com
+Measures cold import time of each top-level module with -X importtime and
+fails when any module exceeds its stored budget
+
+    python benchmarks/import_time.py            # check against import_budget.json
+    python benchmarks/import_time.py --record   # re-record budgets with headroom
+"""
+
+import os
+import sys
+import json
+import argparse
+import subprocess
+from typing import Dict
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BUDGET_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "import_budget.json")
+
+
+def measure_import(module: str) -> int:
+    """Cumulative import time of module in microseconds, in a fresh interpreter"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{result.stderr.strip().splitlines()[-1]}")
+
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:"):].split("|")
+        if len(fields) == 3 and fields[2].strip() == module:
+            return int(fields[1])
+
+    raise RuntimeError(f"No importtime entry for {module}")
+
+
+def measure_all(modules, repeat: int) -> Dict[str, int]:
+    """Best-of-repeat import time for each module"""
+    return {module: min(measure_import(module) for _ in range(repeat)) for module in modules}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check module import times against a budget")
+    parser.add_argument("--budget-file", default=BUDGET_FILE)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--record", action="store_true",
+                        help="write measured times times --headroom as the new budget")
+    parser.add_argument("--headroom", type=float, default=2.0)
+    args = parser.parse_args(argv)
+
+    with open(args.budget_file) as f:
+        budget = json.load(f)
+
+    measured = measure_all(sorted(budget["modules_us"]), args.repeat)
+
+    if args.record:
+        budget["modules_us"] = {
+            module: int(round(elapsed * args.headroom, -3)) for module, elapsed in measured.items()
+        }
+        with open(args.budget_file, "w") as f:
+            json.dump(budget, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(json.dumps(budget, indent=2, sort_keys=True))
+        return 0
+
+    failures = 0
+    for module, elapsed in measured.items():
+        allowed = budget["modules_us"][module]
+        status = "OK" if elapsed <= allowed else "OVER BUDGET"
+        if elapsed > allowed:
+            failures += 1
+        print(f"{status:12} {module:40} {elapsed / 1000:8.1f} ms (budget {allowed / 1000:.1f} ms)")
+
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,210 @@
+"""
+Crystal HTTP Load Test and Latency Benchmark
+Copyright © 2025 Ervin Remus Radosavlevici
+Contact: radosavlevici210@icloud.com
+Starts the Crystal Flask apps in-process on localhost, drives every route
+with concurrent keep-alive clients and reports throughput, latency
+percentiles and bytes per response as diffable JSON
+
+    python benchmarks/load_test.py --concurrency 16 --duration 5 --output before.json
+    python benchmarks/load_test.py --output after.json --compare before.json
+"""
+
+import os
+import sys
+import json
+import time
+import logging
+import argparse
+import threading
+import http.client
+from typing import Any, Dict, List, Optional
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+ROUTE_GROUPS = {
+    "dashboard": [
+        "/",
+        "/crystal-production"
+    ],
+    "components": [
+        "/machine-learning",
+        "/blockchain-verification",
+        "/compliance-frameworks",
+        "/enterprise-apis"
+    ],
+    "status": [
+        "/status",
+        "/system-summary",
+        "/api/crystal/production/status"
+    ]
+}
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(pct / 100.0 * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+
+def drive_load(port: int, routes: List[str], concurrency: int, duration: float,
+               headers: Optional[Dict[str, str]] = None, host: str = "127.0.0.1") -> Dict[str, Any]:
+    """Hit routes round-robin from concurrent keep-alive clients for duration seconds"""
+    headers = headers or {}
+    latencies: List[float] = []
+    totals = {"errors": 0, "bytes": 0}
+    lock = threading.Lock()
+    stop_at = time.monotonic() + duration
+
+    def client(offset: int):
+        conn = http.client.HTTPConnection(host, port, timeout=30)
+        local_latencies = []
+        local_errors = 0
+        local_bytes = 0
+        i = offset
+        while time.monotonic() < stop_at:
+            route = routes[i % len(routes)]
+            i += 1
+            started = time.perf_counter()
+            try:
+                conn.request("GET", route, headers=headers)
+                response = conn.getresponse()
+                body = response.read()
+            except (OSError, http.client.HTTPException):
+                local_errors += 1
+                conn.close()
+                conn = http.client.HTTPConnection(host, port, timeout=30)
+                continue
+            local_latencies.append(time.perf_counter() - started)
+            local_bytes += len(body)
+            if response.status >= 400:
+                local_errors += 1
+        conn.close()
+        with lock:
+            latencies.extend(local_latencies)
+            totals["errors"] += local_errors
+            totals["bytes"] += local_bytes
+
+    started = time.monotonic()
+    threads = [threading.Thread(target=client, args=(n,)) for n in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.monotonic() - started
+
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "errors": totals["errors"],
+        "requests_per_second": round(len(latencies) / elapsed, 1),
+        "bytes_per_response": round(totals["bytes"] / len(latencies)) if latencies else 0,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 3),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 3)
+    }
+
+
+class InProcessServer:
+    """Threaded werkzeug server running a WSGI app on a free localhost port"""
+
+    def __init__(self, app):
+        from werkzeug.serving import make_server
+
+        logging.getLogger("werkzeug").setLevel(logging.ERROR)
+        self.server = make_server("127.0.0.1", 0, app, threaded=True)
+        self.port = self.server.server_port
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.server.shutdown()
+        self.thread.join()
+
+
+def load_application():
+    """Import the combined Crystal WSGI application"""
+    if REPO_ROOT not in sys.path:
+        sys.path.insert(0, REPO_ROOT)
+    from wsgi import application
+    return application
+
+
+def run_load_test(groups: List[str], concurrency: int, duration: float, warmup: float,
+                  accept_encoding: Optional[str]) -> Dict[str, Any]:
+    """Benchmark every route in the selected groups, one route at a time"""
+    headers = {"Accept-Encoding": accept_encoding} if accept_encoding else {}
+    results: Dict[str, Any] = {
+        "config": {
+            "concurrency": concurrency,
+            "duration_s": duration,
+            "accept_encoding": accept_encoding,
+            "python": sys.version.split()[0]
+        },
+        "routes": {}
+    }
+
+    with InProcessServer(load_application()) as server:
+        for group in groups:
+            for route in ROUTE_GROUPS[group]:
+                if warmup:
+                    drive_load(server.port, [route], concurrency, warmup, headers)
+                stats = drive_load(server.port, [route], concurrency, duration, headers)
+                stats["group"] = group
+                results["routes"][route] = stats
+
+    return results
+
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any]) -> List[str]:
+    """Per-route deltas of throughput and tail latency"""
+    lines = []
+    for route, stats in sorted(current["routes"].items()):
+        before = baseline.get("routes", {}).get(route)
+        if not before:
+            lines.append(f"{route:34} (new)")
+            continue
+        rps_delta = (stats["requests_per_second"] / before["requests_per_second"] - 1) * 100 if before["requests_per_second"] else 0.0
+        lines.append(
+            f"{route:34} rps {before['requests_per_second']:>9} -> {stats['requests_per_second']:>9} ({rps_delta:+.1f}%)  "
+            f"p99 {before['p99_ms']:>8} -> {stats['p99_ms']:>8} ms  "
+            f"bytes {before['bytes_per_response']} -> {stats['bytes_per_response']}"
+        )
+    return lines
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load-test every Crystal route in-process")
+    parser.add_argument("--groups", nargs="+", choices=sorted(ROUTE_GROUPS), default=list(ROUTE_GROUPS))
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=5.0, help="seconds per route")
+    parser.add_argument("--warmup", type=float, default=1.0, help="warmup seconds per route")
+    parser.add_argument("--accept-encoding", default=None, help="e.g. 'gzip, br'")
+    parser.add_argument("--output", help="write results JSON to this file")
+    parser.add_argument("--compare", help="baseline results JSON to diff against")
+    args = parser.parse_args(argv)
+
+    results = run_load_test(args.groups, args.concurrency, args.duration, args.warmup, args.accept_encoding)
+    rendered = json.dumps(results, indent=2, sort_keys=True)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(rendered + "\n")
+    else:
+        print(rendered)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        print("\n".join(compare(baseline, results)))
+
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+Activity Log Concurrency Stress Test
+Copyright © 2025 Ervin Remus Radosavlevici
+Contact: radosavlevici210@icloud.com
+Hammers ConcurrentActivityLog from many threads, verifies that no entry is
+lost or reordered within a thread, and reports append throughput next to a
+single-lock list baseline
+
+    python benchmarks/stress_activity_log.py --threads 32 --per-thread 20000
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from activity_log import ConcurrentActivityLog
+
+
+class LockedListLog:
+    """Baseline: one global lock around a list append"""
+
+    def __init__(self):
+        self.entries = []
+        self.lock = threading.Lock()
+
+    def append(self, entry):
+        with self.lock:
+            self.entries.append(entry)
+
+
+def run_producers(log, threads: int, per_thread: int, with_reader: bool) -> float:
+    """Append per_thread entries from each thread; return elapsed seconds"""
+    start_barrier = threading.Barrier(threads + 1)
+    stop_reader = threading.Event()
+
+    def producer(worker_id: int):
+        start_barrier.wait()
+        for i in range(per_thread):
+            log.append((worker_id, i))
+
+    def reader():
+        while not stop_reader.is_set():
+            log.snapshot(50)
+            time.sleep(0.001)
+
+    workers = [threading.Thread(target=producer, args=(n,)) for n in range(threads)]
+    for worker in workers:
+        worker.start()
+    reader_thread = threading.Thread(target=reader) if with_reader else None
+    if reader_thread:
+        reader_thread.start()
+
+    start_barrier.wait()
+    started = time.perf_counter()
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - started
+
+    stop_reader.set()
+    if reader_thread:
+        reader_thread.join()
+    return elapsed
+
+
+def verify(entries, threads: int, per_thread: int):
+    """Every (thread, i) must appear exactly once and in order per thread"""
+    errors = []
+    if len(entries) != threads * per_thread:
+        errors.append(f"expected {threads * per_thread} entries, found {len(entries)}")
+
+    next_expected = [0] * threads
+    for worker_id, i in entries:
+        if i != next_expected[worker_id]:
+            errors.append(f"thread {worker_id}: expected entry {next_expected[worker_id]}, got {i}")
+            break
+        next_expected[worker_id] += 1
+
+    missing = [n for n, count in enumerate(next_expected) if count != per_thread]
+    if missing:
+        errors.append(f"threads with missing entries: {missing[:10]}")
+    return errors
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Stress test the concurrent activity log")
+    parser.add_argument("--threads", type=int, default=32)
+    parser.add_argument("--per-thread", type=int, default=20000)
+    parser.add_argument("--no-reader", action="store_true", help="skip the concurrent snapshot reader")
+    args = parser.parse_args(argv)
+
+    total = args.threads * args.per_thread
+
+    log = ConcurrentActivityLog(capacity=total)
+    elapsed = run_producers(log, args.threads, args.per_thread, with_reader=not args.no_reader)
+    errors = verify(log.snapshot(total), args.threads, args.per_thread)
+
+    baseline = LockedListLog()
+    baseline_elapsed = run_producers(baseline, args.threads, args.per_thread, with_reader=False)
+
+    print(json.dumps({
+        "threads": args.threads,
+        "entries": total,
+        "lost_or_reordered": errors,
+        "concurrent_log_appends_per_second": round(total / elapsed),
+        "locked_list_appends_per_second": round(total / baseline_elapsed)
+    }, indent=2))
+
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
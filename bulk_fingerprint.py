@@ -0,0 +1,135 @@
+"""
+Bulk Fingerprint - Multithreaded SHA-256 File Fingerprinting
+Copyright © 2025 Ervin Remus Radosavlevici
+Official Owner: Ervin Remus Radosavlevici
+Contact: radosavlevici210@icloud.com
+Hashes many files across a thread pool and streams results in input order
+
+hashlib releases the GIL while hashing large buffers, so files are read
+with readinto() into a reusable per-thread buffer and hashed in parallel.
+At most threads * WINDOW_PER_THREAD files are in flight, which bounds
+memory however many paths are given.
+
+    python bulk_fingerprint.py repo/ other.bin --threads 8 > fingerprints.ndjson
+    find repo -type f | python bulk_fingerprint.py - > fingerprints.ndjson
+"""
+
+import os
+import sys
+import json
+import hashlib
+import threading
+from collections import deque
+from typing import Any, Dict, Iterable, Iterator, Optional
+
+DEFAULT_BUFFER_SIZE = 1 << 20
+WINDOW_PER_THREAD = 4
+
+_buffers = threading.local()
+
+
+def fingerprint_file(path: str, buffer_size: int = DEFAULT_BUFFER_SIZE) -> Dict[str, Any]:
+    """SHA-256 hex digest and size of one file, or the error reading it"""
+    buffer = getattr(_buffers, "buffer", None)
+    if buffer is None or len(buffer) != buffer_size:
+        buffer = _buffers.buffer = bytearray(buffer_size)
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        with open(path, "rb", buffering=0) as f, memoryview(buffer) as view:
+            while True:
+                count = f.readinto(buffer)
+                if not count:
+                    break
+                digest.update(view[:count])
+                size += count
+    except OSError as e:
+        return {"path": path, "error": e.strerror or str(e)}
+    return {"path": path, "sha256": digest.hexdigest(), "size": size}
+
+
+def fingerprint_files(paths: Iterable[str], threads: Optional[int] = None,
+                      buffer_size: int = DEFAULT_BUFFER_SIZE) -> Iterator[Dict[str, Any]]:
+    """Fingerprint paths on a thread pool, yielding results in input order"""
+    if buffer_size < 1:
+        raise ValueError(f"buffer_size must be at least 1, got {buffer_size}")
+    if threads is not None and threads < 1:
+        raise ValueError(f"threads must be at least 1, got {threads}")
+    return _fingerprint_files(paths, threads or min(32, (os.cpu_count() or 1) + 4), buffer_size)
+
+
+def _fingerprint_files(paths: Iterable[str], threads: int, buffer_size: int) -> Iterator[Dict[str, Any]]:
+    if threads == 1:
+        for path in paths:
+            yield fingerprint_file(path, buffer_size)
+        return
+
+    # Imported here so importing this module stays cheap for callers like merkle_proofs
+    from concurrent.futures import ThreadPoolExecutor
+
+    window = threads * WINDOW_PER_THREAD
+    pending: deque = deque()
+    with ThreadPoolExecutor(max_workers=threads, thread_name_prefix="fingerprint") as pool:
+        for path in paths:
+            pending.append(pool.submit(fingerprint_file, path, buffer_size))
+            if len(pending) >= window:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def iter_paths(arguments: Iterable[str]) -> Iterator[str]:
+    """Files named by arguments; directories are walked, "-" reads paths from stdin"""
+    for argument in arguments:
+        if argument == "-":
+            for line in sys.stdin:
+                line = line.rstrip("\n")
+                if line:
+                    yield line
+        elif os.path.isdir(argument):
+            for directory, subdirectories, files in os.walk(argument):
+                subdirectories.sort()
+                for name in sorted(files):
+                    yield os.path.join(directory, name)
+        else:
+            yield argument
+
+
+def _positive_int(value: str) -> int:
+    """argparse type for options that must be at least 1"""
+    import argparse
+
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid int value: {value!r}")
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+    return number
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Stream SHA-256 fingerprints of files as NDJSON")
+    parser.add_argument("paths", nargs="*", default=["-"], help="files, directories or - for stdin")
+    parser.add_argument("--threads", type=_positive_int, default=None)
+    parser.add_argument("--buffer-size", type=_positive_int, default=DEFAULT_BUFFER_SIZE)
+    args = parser.parse_args(argv)
+
+    failed = 0
+    write = sys.stdout.write
+    try:
+        for result in fingerprint_files(iter_paths(args.paths), args.threads, args.buffer_size):
+            failed += "error" in result
+            write(json.dumps(result, ensure_ascii=False) + "\n")
+        sys.stdout.flush()
+    except BrokenPipeError:
+        # Reader went away (e.g. piped into head); exit quietly
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return 1
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,243 @@
+"""
+Copyright Notice Scanner - Parallel, Incremental Repository Audit
+Copyright © 2025 Ervin Remus Radosavlevici
+Official Owner: Ervin Remus Radosavlevici
+Contact: radosavlevici210@icloud.com
+Walks local repository checkouts and flags source files whose copyright
+notice is missing or altered
+
+Only the header region of each file is read, with os.pread. Results are
+cached by (path, inode, mtime, size) so a re-scan reads changed files only;
+large batches of changed files are classified on a process pool.
+
+Cached verdicts are trusted without re-reading the file, so the cache lives
+in a per-user directory (mode 0700) and is ignored unless it is owned by
+the current user and writable by no one else.
+"""
+
+import os
+import json
+import stat
+import time
+import hashlib
+import logging
+import tempfile
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+REQUIRED_NOTICE = "Copyright © 2025 Ervin Remus Radosavlevici"
+HEADER_BYTES = 4096
+SCAN_EXTENSIONS = frozenset({".py", ".js", ".ts", ".jsx", ".tsx", ".html", ".css", ".sh"})
+SKIP_DIRECTORIES = frozenset({".git", "__pycache__", "node_modules", ".venv", "venv", ".tox"})
+# Changed-file count from which a process pool beats reading in-process
+POOL_THRESHOLD = 2000
+BATCH_SIZE = 512
+
+STATUS_OK = "ok"
+STATUS_MISSING = "missing"
+STATUS_ALTERED = "altered"
+STATUS_UNREADABLE = "unreadable"
+
+
+def private_directory(directory: str) -> str:
+    """Create directory with mode 0700 if needed and check that it is private
+
+    Raises PermissionError if it is not a real directory owned by the
+    current user with no group or other permissions.
+    """
+    os.makedirs(directory, mode=0o700, exist_ok=True)
+    info = os.lstat(directory)
+    if not stat.S_ISDIR(info.st_mode) or info.st_uid != os.getuid() or info.st_mode & 0o077:
+        raise PermissionError(f"{directory} is not a private directory of the current user")
+    return directory
+
+
+def user_cache_dir(name: str = "") -> str:
+    """Private per-user cache directory, or a subdirectory name of it
+
+    Uses $XDG_CACHE_HOME/crystal or ~/.cache/crystal, falling back to
+    crystal-<uid> in the temp directory. Raises PermissionError if the
+    directory is owned by someone else or open to other users.
+    """
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    directory = os.path.join(base, "crystal")
+    try:
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+    except OSError:
+        directory = os.path.join(tempfile.gettempdir(), f"crystal-{os.getuid()}")
+    directory = private_directory(directory)
+    return private_directory(os.path.join(directory, name)) if name else directory
+
+
+def read_private_json(path: str) -> Optional[Any]:
+    """JSON from path, or None if missing, invalid or writable by another user"""
+    try:
+        with open(path) as f:
+            info = os.fstat(f.fileno())
+            if info.st_uid != os.getuid() or info.st_mode & 0o022:
+                logging.warning(f"Ignoring {path}: not owned by this user or writable by others")
+                return None
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        logging.warning(f"Ignoring unreadable cache {path}: {e}")
+        return None
+
+
+def write_private_json(path: str, data: Any) -> bool:
+    """Write JSON atomically with mode 0600; log and clean up on failure"""
+    temp_path = None
+    try:
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            json.dump(data, f, separators=(",", ":"))
+        os.replace(temp_path, path)
+        return True
+    except OSError as e:
+        logging.warning(f"Could not save {path}: {e}")
+        if temp_path is not None:
+            try:
+                os.unlink(temp_path)
+            except OSError:
+                pass
+        return False
+
+
+def classify_header(header: bytes, notice: str) -> str:
+    """ok, altered (some other copyright line) or missing"""
+    text = header.decode("utf-8", "ignore")
+    if notice in text:
+        return STATUS_OK
+    if "copyright" in text.lower():
+        return STATUS_ALTERED
+    return STATUS_MISSING
+
+
+def classify_files(paths: Sequence[str], notice: str, header_bytes: int = HEADER_BYTES) -> List[Tuple[str, str]]:
+    """Read each file's header region and classify it"""
+    results = []
+    for path in paths:
+        try:
+            fd = os.open(path, os.O_RDONLY)
+            try:
+                header = os.pread(fd, header_bytes, 0)
+            finally:
+                os.close(fd)
+        except OSError:
+            results.append((path, STATUS_UNREADABLE))
+            continue
+        results.append((path, classify_header(header, notice)))
+    return results
+
+
+def iter_source_files(root: str, extensions=SCAN_EXTENSIONS) -> Iterator[Tuple[str, Tuple[int, int, int]]]:
+    """(path, (inode, mtime_ns, size)) for every source file under root
+
+    extensions=None yields every regular file.
+    """
+    stack = [root]
+    while stack:
+        directory = stack.pop()
+        try:
+            entries = os.scandir(directory)
+        except OSError:
+            continue
+        with entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name not in SKIP_DIRECTORIES:
+                        stack.append(entry.path)
+                elif entry.is_file(follow_symlinks=False) and (
+                        extensions is None or os.path.splitext(entry.name)[1] in extensions):
+                    try:
+                        stat = entry.stat(follow_symlinks=False)
+                    except OSError:
+                        continue
+                    yield entry.path, (entry.inode(), stat.st_mtime_ns, stat.st_size)
+
+
+class CopyrightScanner:
+    """Incremental copyright notice audit over repository checkouts"""
+
+    def __init__(self, notice: str = REQUIRED_NOTICE, cache_path: Optional[str] = None,
+                 extensions=SCAN_EXTENSIONS, header_bytes: int = HEADER_BYTES,
+                 workers: Optional[int] = None):
+        self.notice = notice
+        self.cache_path = cache_path or os.environ.get("CRYSTAL_COPYRIGHT_CACHE")
+        if not self.cache_path:
+            try:
+                self.cache_path = os.path.join(user_cache_dir(), "copyright_cache.json")
+            except OSError as e:
+                logging.warning(f"Copyright scan cache disabled: {e}")
+        self.extensions = frozenset(extensions) if extensions is not None else None
+        self.header_bytes = header_bytes
+        self.workers = workers
+        # Cached results are only valid for the same notice and header size
+        self._cache_version = hashlib.sha256(f"{notice}|{header_bytes}".encode("utf-8")).hexdigest()[:16]
+
+    def scan(self, roots: Sequence[str]) -> Dict[str, Any]:
+        """Audit every source file under roots, re-reading only changed files"""
+        started = time.perf_counter()
+        roots = [os.path.abspath(root) for root in roots]
+        cache = self._load_cache()
+        files: Dict[str, Tuple[int, int, int]] = {}
+        for root in roots:
+            for path, signature in iter_source_files(root, self.extensions):
+                files[path] = signature
+
+        results: Dict[str, str] = {}
+        changed = []
+        for path, signature in files.items():
+            cached = cache.get(path)
+            if cached is not None and tuple(cached[:3]) == signature:
+                results[path] = cached[3]
+            else:
+                changed.append(path)
+
+        for path, status in self._classify(changed):
+            results[path] = status
+
+        # Entries for other checkouts stay; ones under these roots are replaced
+        prefixes = tuple(os.path.join(root, "") for root in roots)
+        updated = {path: entry for path, entry in cache.items() if not path.startswith(prefixes)}
+        updated.update((path, [*files[path], status]) for path, status in results.items())
+        if changed or len(updated) != len(cache):
+            self._save_cache(updated)
+
+        report: Dict[str, Any] = {
+            "roots": roots,
+            "files_scanned": len(results),
+            "files_read": len(changed),
+            "missing_notice": sorted(path for path, status in results.items() if status == STATUS_MISSING),
+            "altered_notice": sorted(path for path, status in results.items() if status == STATUS_ALTERED),
+            "unreadable": sorted(path for path, status in results.items() if status == STATUS_UNREADABLE),
+            "elapsed_seconds": round(time.perf_counter() - started, 3)
+        }
+        report["compliant"] = not (report["missing_notice"] or report["altered_notice"])
+        return report
+
+    def _classify(self, paths: List[str]) -> Iterator[Tuple[str, str]]:
+        """Classify changed files, on a process pool for large batches"""
+        if len(paths) < POOL_THRESHOLD:
+            yield from classify_files(paths, self.notice, self.header_bytes)
+            return
+
+        # Imported here: multiprocessing is costly to import and rarely needed
+        from concurrent.futures import ProcessPoolExecutor
+
+        batches = [paths[i:i + BATCH_SIZE] for i in range(0, len(paths), BATCH_SIZE)]
+        with ProcessPoolExecutor(max_workers=self.workers) as pool:
+            for batch in pool.map(classify_files, batches,
+                                  [self.notice] * len(batches), [self.header_bytes] * len(batches)):
+                yield from batch
+
+    def _load_cache(self) -> Dict[str, List[Any]]:
+        data = read_private_json(self.cache_path) if self.cache_path else None
+        if not isinstance(data, dict) or data.get("version") != self._cache_version:
+            return {}
+        return data.get("files", {})
+
+    def _save_cache(self, files: Dict[str, List[Any]]):
+        """Write the cache atomically so a crash never leaves it half written"""
+        if self.cache_path:
+            write_private_json(self.cache_path, {"version": self._cache_version, "files": files})
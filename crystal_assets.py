@@ -0,0 +1,159 @@
+"""
+Crystal Computer Static Asset Pipeline
+Copyright © 2025 Ervin Remus Radosavlevici
+Official Owner: Ervin Remus Radosavlevici
+Contact: radosavlevici210@icloud.com
+Extracts, minifies and fingerprints the production interface CSS/JS
+
+Build step:
+    python crystal_assets.py [output_dir]
+
+writes crystal.<hash>.css, crystal.<hash>.js and manifest.json. At runtime
+the same bundle is built in memory and served with immutable caching.
+"""
+
+import os
+import re
+import sys
+import json
+import hashlib
+from typing import Dict
+
+from render_cache import RenderedPage, make_cached_response
+
+ASSET_URL_PREFIX = "/assets/crystal"
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+_CSS_COMMENT = re.compile(r"/\*.*?\*/", re.S)
+_CSS_TIGHT = set("{};,>")
+
+
+def minify_css(css: str) -> str:
+    """Collapse whitespace and comments in a stylesheet, keeping strings intact"""
+    css = _CSS_COMMENT.sub("", css)
+    out = []
+    quote = None
+    pending_space = False
+
+    for char in css:
+        if quote:
+            out.append(char)
+            if char == quote:
+                quote = None
+            continue
+
+        if char.isspace():
+            pending_space = True
+            continue
+
+        if pending_space and out and out[-1] not in _CSS_TIGHT and char not in _CSS_TIGHT and out[-1] != ":":
+            out.append(" ")
+        pending_space = False
+
+        if char == "}" and out and out[-1] == ";":
+            out.pop()
+        if char in "'\"":
+            quote = char
+        out.append(char)
+
+    return "".join(out)
+
+
+def minify_js(js: str) -> str:
+    """Strip comment lines and indentation from a script
+
+    Line breaks are kept so automatic semicolon insertion behaves exactly
+    as in the unminified source.
+    """
+    lines = []
+    for line in js.splitlines():
+        line = line.strip()
+        if not line or line.startswith("//"):
+            continue
+        lines.append(line)
+    return "\n".join(lines)
+
+
+def content_hash(data: bytes) -> str:
+    """Short content hash used in asset file names"""
+    return hashlib.sha256(data).hexdigest()[:16]
+
+
+class AssetBundle:
+    """Minified, fingerprinted CSS and JS for one production interface"""
+
+    def __init__(self, css: str, js: str):
+        self.css = minify_css(css).encode("utf-8")
+        self.js = minify_js(js).encode("utf-8")
+        self.css_name = f"crystal.{content_hash(self.css)}.css"
+        self.js_name = f"crystal.{content_hash(self.js)}.js"
+
+    @classmethod
+    def from_system(cls, crystal_system) -> "AssetBundle":
+        """Build the bundle from a ProductionCrystalSystem"""
+        return cls(crystal_system._render_css(), crystal_system._render_js())
+
+    def manifest(self) -> Dict[str, str]:
+        """Logical asset names mapped to fingerprinted file names"""
+        return {"crystal.css": self.css_name, "crystal.js": self.js_name}
+
+    def urls(self, prefix: str = ASSET_URL_PREFIX) -> Dict[str, str]:
+        """Public URLs for the stylesheet and script"""
+        return {
+            "css": f"{prefix}/{self.css_name}",
+            "js": f"{prefix}/{self.js_name}"
+        }
+
+    def pages(self) -> Dict[str, RenderedPage]:
+        """Precompressed responses for each fingerprinted file"""
+        return {
+            self.css_name: RenderedPage(content_hash(self.css), self.css, "text/css; charset=utf-8"),
+            self.js_name: RenderedPage(content_hash(self.js), self.js, "application/javascript; charset=utf-8")
+        }
+
+    def write(self, output_dir: str) -> Dict[str, str]:
+        """Write the fingerprinted files and manifest.json to output_dir"""
+        os.makedirs(output_dir, exist_ok=True)
+
+        for name, data in ((self.css_name, self.css), (self.js_name, self.js)):
+            with open(os.path.join(output_dir, name), "wb") as f:
+                f.write(data)
+
+        manifest = self.manifest()
+        with open(os.path.join(output_dir, "manifest.json"), "w") as f:
+            json.dump(manifest, f, indent=2, sort_keys=True)
+
+        return manifest
+
+
+def register_asset_routes(app, bundle: AssetBundle, prefix: str = ASSET_URL_PREFIX):
+    """Serve a bundle's files from memory with immutable caching"""
+    from flask import abort, request
+
+    pages = bundle.pages()
+
+    @app.route(f"{prefix}/<filename>", endpoint="crystal_asset")
+    def crystal_asset(filename):
+        """Fingerprinted Crystal Computer asset"""
+        page = pages.get(filename)
+        if page is None:
+            abort(404)
+
+        response = make_cached_response(page, request)
+        response.headers["Cache-Control"] = IMMUTABLE_CACHE_CONTROL
+        return response
+
+
+def build_assets(output_dir: str) -> Dict[str, str]:
+    """Build the production interface assets into output_dir"""
+    from production_crystal_system import ProductionCrystalSystem
+
+    bundle = AssetBundle.from_system(ProductionCrystalSystem())
+    return bundle.write(output_dir)
+
+
+if __name__ == "__main__":
+    target = sys.argv[1] if len(sys.argv) > 1 else os.path.join("static", "crystal")
+    manifest = build_assets(target)
+    for logical, built in sorted(manifest.items()):
+        print(f"✅ {logical} -> {os.path.join(target, built)}")
@@ -10,17 +10,36 @@ Licensed under MIT License with additional copyright protections
 All rights reserved.
 """
 
+import os
 import json
+import atexit
 import time
 import random
+import logging
 import threading
 from datetime import datetime
-from typing import Dict, List, Any
+from typing import TYPE_CHECKING, Callable, Dict, List, Any, Optional, Union
+
+from activity_log import DEFAULT_CAPACITY, ActivityRecord, ConcurrentActivityLog, RingView
+from status_serializer import FrozenDict, dumps
+
+# activity_journal, activity_stream, scheduler and shared_state are imported
+# where first needed: most processes never configure or use them
+if TYPE_CHECKING:
+    from activity_stream import ActivityBroadcaster
+
+SYSTEM_NAME = "Crystal Computer Ultimate"
+# Seconds between activity stream flushes
+STREAM_FLUSH_INTERVAL = 0.25
+# Longest a locally logged entry waits before other workers can see it
+SHARED_MERGE_INTERVAL = 0.25
 
 class CrystalComputerSystem:
     """Advanced Crystal Computer with 6000+ features and neural interface"""
     
-    def __init__(self):
+    def __init__(self, activity_log_capacity: int = DEFAULT_CAPACITY,
+                 journal_dir: Optional[str] = None,
+                 shared_state_path: Optional[str] = None):
         self.owner = "Ervin Remus Radosavlevici"
         self.contact = "radosavlevici210@icloud.com"
         self.copyright = "© 2025 Ervin Remus Radosavlevici"
@@ -41,18 +60,82 @@ class CrystalComputerSystem:
         
         # Active monitoring
         self.monitoring_active = False
-        self.activity_log = []
+        self._monitor_task = None
         
-    def get_watermark(self):
-        """Generate dynamic watermark with copyright and timestamp"""
-        return {
-            "copyright": self.copyright,
-            "owner": self.owner,
-            "contact": self.contact,
-            "timestamp": self.system_timestamp,
-            "system": "Crystal Computer Ultimate",
-            "features": f"{self.crystal_features}+ Features Active"
-        }
+        # (source fields, watermark, encoded watermark)
+        self._watermark = None
+        # Persistent history; batches are written as the log merges.
+        # A journal directory belongs to one process; opening one that another
+        # process holds raises RuntimeError, so give each worker its own.
+        journal_dir = journal_dir or os.environ.get("CRYSTAL_ACTIVITY_JOURNAL_DIR")
+        self.journal = None
+        if journal_dir:
+            from activity_journal import ActivityJournal
+            self.journal = ActivityJournal(journal_dir)
+        
+        # Status and activity ring shared by every worker process on the host.
+        # Only system_timestamp and monitor_pid live in the shared status; the
+        # other status fields are constants, identical in every worker.
+        shared_state_path = shared_state_path or os.environ.get("CRYSTAL_SHARED_STATE_PATH")
+        self.shared_state = None
+        if shared_state_path:
+            from shared_state import SharedState
+            self.shared_state = SharedState(shared_state_path, slots=activity_log_capacity)
+            status = self.shared_state.setdefault_status(system_timestamp=self.system_timestamp)
+            self.system_timestamp = status["system_timestamp"]
+        
+        # Live tail for SSE subscribers, created by get_activity_stream()
+        self.activity_stream = None
+        self._stream_task = None
+        self._stream_lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._shared_cursor = -1
+        
+        # Written by the monitor thread and request threads concurrently.
+        # Entries reach the journal and shared ring in merged batches, so
+        # logging never takes the cross-process lock itself.
+        persistent = self.journal is not None or self.shared_state is not None
+        self.activity_log = ConcurrentActivityLog(
+            activity_log_capacity,
+            sink=self._persist_records,
+            max_delay=(SHARED_MERGE_INTERVAL if self.shared_state is not None else 1.0) if persistent else None
+        )
+        self._merge_task = None
+        if persistent:
+            atexit.register(self.activity_log.merge)
+        if self.shared_state is not None:
+            from scheduler import get_scheduler
+            
+            # max_delay only fires on the next append; this tick publishes
+            # entries from a worker that has gone quiet
+            self._merge_task = get_scheduler().schedule(
+                lambda: self.activity_log.merge(blocking=False), SHARED_MERGE_INTERVAL
+            )
+        
+    def get_watermark(self) -> FrozenDict:
+        """Read-only watermark with copyright and timestamp
+        
+        Built once and rebuilt only when one of its source fields changes.
+        """
+        key = (self.copyright, self.owner, self.contact, self.system_timestamp, self.crystal_features)
+        cached = self._watermark
+        if cached is None or cached[0] != key:
+            watermark = FrozenDict({
+                "copyright": self.copyright,
+                "owner": self.owner,
+                "contact": self.contact,
+                "timestamp": self.system_timestamp,
+                "system": SYSTEM_NAME,
+                "features": f"{self.crystal_features}+ Features Active"
+            })
+            cached = (key, watermark, dumps(watermark))
+            self._watermark = cached
+        return cached[1]
+    
+    def get_watermark_json(self) -> bytes:
+        """Pre-serialized JSON of the current watermark"""
+        self.get_watermark()
+        return self._watermark[2]
     
     def initialize_crystal_core(self) -> Dict[str, Any]:
         """Initialize the quantum crystal core"""
@@ -247,51 +330,163 @@ class CrystalComputerSystem:
             "watermark": self.get_watermark()
         }
     
-    def start_continuous_monitoring(self):
-        """Start continuous system monitoring in background"""
+    def start_continuous_monitoring(self, interval: float = 30.0, jitter: float = 0.0):
+        """Start continuous system monitoring on the shared scheduler"""
         if self.monitoring_active:
             return {"status": "Monitoring already active"}
         
+        from scheduler import get_scheduler
+        
         self.monitoring_active = True
         self._log_activity("Continuous monitoring started")
-        
-        def monitor_loop():
-            while self.monitoring_active:
-                # Generate random system status updates
-                status_updates = [
-                    "Quantum coherence maintained at optimal levels",
-                    f"Neural electrodes ({self.neural_electrodes}) functioning perfectly",
-                    "Crystal resonance frequency stable",
-                    "Divine connection signal strength: Maximum",
-                    "Transcendent mode operations proceeding smoothly",
-                    "God mode capabilities standing by",
-                    "Reality control systems nominal",
-                    "Consciousness expansion protocols active",
-                    "Universal power flow: Unlimited",
-                    "Quantum security barriers: Impenetrable"
-                ]
-                
-                self._log_activity(random.choice(status_updates))
-                time.sleep(30)  # Update every 30 seconds
-        
-        monitoring_thread = threading.Thread(target=monitor_loop, daemon=True)
-        monitoring_thread.start()
+        self._monitor_task = get_scheduler().schedule(self._monitor_tick, interval, jitter, initial_delay=0)
         
         return {
             "status": "Continuous monitoring started",
-            "monitoring_interval": "30 seconds",
+            "monitoring_interval": f"{interval:g} seconds",
             "watermark": self.get_watermark()
         }
     
     def stop_monitoring(self):
         """Stop continuous monitoring"""
         self.monitoring_active = False
+        if self._monitor_task is not None:
+            self._monitor_task.cancel()
+            self._monitor_task = None
+        if self.shared_state is not None and self.shared_state.is_leader:
+            self.shared_state.resign()
+            self.shared_state.update_status(monitor_pid=None)
         self._log_activity("Continuous monitoring stopped")
         return {"status": "Monitoring stopped"}
     
-    def get_activity_log(self) -> List[Dict[str, str]]:
-        """Get recent activity log entries"""
-        return self.activity_log[-50:]  # Return last 50 entries
+    def close(self):
+        """Stop monitoring and every scheduled task, then flush and release storage
+        
+        Scheduled callbacks hold the instance, so one that is discarded
+        without close() keeps its tasks running on the shared scheduler.
+        """
+        if self.monitoring_active:
+            self.stop_monitoring()
+        with self._stream_lock:
+            for task in (self._merge_task, self._stream_task):
+                if task is not None:
+                    task.cancel()
+            self._merge_task = None
+            self._stream_task = None
+        if self.journal is not None or self.shared_state is not None:
+            atexit.unregister(self.activity_log.merge)
+            self.activity_log.merge()
+        if self.journal is not None:
+            self.journal.close()
+        if self.shared_state is not None:
+            self.shared_state.close()
+    
+    def _monitor_tick(self):
+        """Log one random system status update
+        
+        With shared state every worker ticks but only the elected leader
+        logs; another worker takes over on its next tick if the leader
+        exits.
+        """
+        if self.shared_state is not None:
+            was_leader = self.shared_state.is_leader
+            if not self.shared_state.try_lead():
+                return
+            if not was_leader:
+                self.shared_state.update_status(monitor_pid=os.getpid())
+        
+        status_updates = [
+            "Quantum coherence maintained at optimal levels",
+            f"Neural electrodes ({self.neural_electrodes}) functioning perfectly",
+            "Crystal resonance frequency stable",
+            "Divine connection signal strength: Maximum",
+            "Transcendent mode operations proceeding smoothly",
+            "God mode capabilities standing by",
+            "Reality control systems nominal",
+            "Consciousness expansion protocols active",
+            "Universal power flow: Unlimited",
+            "Quantum security barriers: Impenetrable"
+        ]
+        self._log_activity(random.choice(status_updates))
+    
+    def get_activity_log(self, limit: Optional[int] = 50,
+                         since: Union[datetime, float, None] = None,
+                         until: Union[datetime, float, None] = None) -> List[Dict[str, str]]:
+        """Get activity log entries, optionally within a time range
+
+        Range queries read the persistent journal when one is configured and
+        fall back to the in-memory log otherwise. With since set the oldest
+        limit matches are returned, otherwise the most recent.
+        """
+        if self.shared_state is not None and self.journal is None:
+            self.activity_log.merge()
+            records = self.shared_state.tail(limit if since is None and until is None else None)
+            since_ts = _epoch(since)
+            until_ts = _epoch(until)
+            records = [
+                (ts, message) for _, ts, message in records
+                if (since_ts is None or ts >= since_ts) and (until_ts is None or ts <= until_ts)
+            ]
+            if limit is not None:
+                records = records[:limit] if since is not None else records[-limit:]
+            return [_activity_entry(ts, message) for ts, message in records]
+        
+        if since is None and until is None:
+            records = self.activity_log.snapshot(self.activity_log.capacity if limit is None else limit)
+            return [_activity_entry(record.timestamp, record.message) for record in records]
+
+        since_ts = _epoch(since)
+        until_ts = _epoch(until)
+        if self.journal is not None:
+            self.activity_log.merge()
+            return [
+                _activity_entry(ts, message)
+                for ts, message in self.journal.query(since_ts, until_ts, limit)
+            ]
+
+        records = [
+            record for record in self.activity_log.snapshot(self.activity_log.capacity)
+            if (since_ts is None or record.timestamp >= since_ts)
+            and (until_ts is None or record.timestamp <= until_ts)
+        ]
+        if limit is not None:
+            records = records[:limit] if since is not None else records[-limit:]
+        return [_activity_entry(record.timestamp, record.message) for record in records]
+    
+    def get_activity_stream(self) -> "ActivityBroadcaster":
+        """Broadcaster pushing new activity entries to stream subscribers
+        
+        The first call starts a short periodic flush on the shared scheduler
+        so buffered entries (or, with shared state, entries from other
+        workers) reach subscribers promptly.
+        
+        Event ids are global where possible: shared ring sequence + 1 with
+        shared state, journal record number with a journal, otherwise a
+        per-process count. The history is seeded from the shared ring and
+        caught up on every call, so a client resuming with Last-Event-ID
+        on any worker continues where it left off.
+        """
+        if self._stream_task is None:
+            with self._stream_lock:
+                if self._stream_task is None:
+                    from activity_stream import ActivityBroadcaster
+                    from scheduler import get_scheduler
+                    
+                    last_id = 0
+                    if self.shared_state is None and self._journal_ids():
+                        self.activity_log.merge()
+                        last_id = len(self.journal)
+                    self.activity_stream = ActivityBroadcaster(history=self.activity_log.capacity, last_id=last_id)
+                    self._stream_task = get_scheduler().schedule(
+                        self._flush_activity_stream, STREAM_FLUSH_INTERVAL
+                    )
+        if self.shared_state is not None:
+            self._flush_activity_stream()
+        return self.activity_stream
+    
+    def get_activity_view(self, limit: int = 50) -> RingView:
+        """Copy-free view of the most recent ActivityRecord entries"""
+        return self.activity_log.view(limit)
     
     def get_system_status(self) -> Dict[str, Any]:
         """Get comprehensive system status"""
@@ -312,74 +507,214 @@ class CrystalComputerSystem:
     
     def _log_activity(self, message: str):
         """Log system activity with timestamp"""
-        log_entry = {
-            "timestamp": datetime.now().isoformat(),
-            "message": message,
-            "system": "Crystal Computer Ultimate"
-        }
-        self.activity_log.append(log_entry)
+        self.activity_log.append(ActivityRecord(time.time(), message))
+
+    def _log_activities(self, messages: List[str]):
+        """Log several activities with one timestamp in a single append"""
+        timestamp = time.time()
+        self.activity_log.extend([ActivityRecord(timestamp, message) for message in messages])
+
+    def _persist_records(self, records: List[ActivityRecord]):
+        """Write a merged batch of activity records to the journal, shared ring and stream
         
-        # Keep only last 1000 entries
-        if len(self.activity_log) > 1000:
-            self.activity_log = self.activity_log[-1000:]
+        Runs under the activity log's merge lock, so batches arrive in order.
+        """
+        ids = None
+        if self.journal is not None or self.shared_state is not None:
+            pairs = [(record.timestamp, record.message) for record in records]
+            try:
+                if self.shared_state is not None:
+                    self.shared_state.append_many(pairs)
+                if self.journal is not None:
+                    self.journal.append_many(pairs)
+                    if self._journal_ids():
+                        end = len(self.journal)
+                        ids = range(end - len(records) + 1, end + 1)
+            except OSError:
+                logging.exception("Failed to persist activity records; entries kept in memory only")
+        # With shared state the stream is fed from the shared ring instead
+        if self.shared_state is None and self._stream_task is not None:
+            self.activity_stream.publish([
+                _activity_entry(record.timestamp, record.message) for record in records
+            ], ids)
+    
+    def _journal_ids(self) -> bool:
+        """Whether journal record numbers can serve as event ids
+        
+        They survive restarts, but only stay increasing while no old
+        segments are deleted.
+        """
+        return self.journal is not None and self.journal.max_segments is None
+    
+    def _flush_activity_stream(self):
+        """Merge buffered entries; with shared state, relay every worker's entries"""
+        self.activity_log.merge(blocking=False)
+        if self.shared_state is not None:
+            with self._flush_lock:
+                records = self.shared_state.tail(after=self._shared_cursor)
+                if records:
+                    self._shared_cursor = records[-1][0]
+                    self.activity_stream.publish(
+                        [_activity_entry(ts, message) for _, ts, message in records],
+                        [sequence + 1 for sequence, _, _ in records]
+                    )
+
+
+def _activity_entry(timestamp: float, message: str) -> Dict[str, str]:
+    """Serialized activity entry; timestamps are formatted only here"""
+    return {
+        "timestamp": datetime.fromtimestamp(timestamp).isoformat(),
+        "message": message,
+        "system": SYSTEM_NAME
+    }
+
+def _epoch(value: Union[datetime, float, str, None]) -> Optional[float]:
+    """Normalise a datetime, ISO string or epoch seconds to epoch seconds"""
+    if value is None:
+        return None
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    if isinstance(value, datetime):
+        return value.timestamp()
+    return float(value)
 
 # Global instance
 _crystal_system_instance = None
 
+_crystal_system_lock = threading.Lock()
+
 def get_crystal_computer_system():
     """Get the global Crystal Computer system instance"""
     global _crystal_system_instance
     if _crystal_system_instance is None:
-        _crystal_system_instance = CrystalComputerSystem()
-        _crystal_system_instance._log_activity("Crystal Computer Ultimate system initialized")
-        _crystal_system_instance.start_continuous_monitoring()
+        with _crystal_system_lock:
+            if _crystal_system_instance is None:
+                crystal_system = CrystalComputerSystem()
+                crystal_system._log_activity("Crystal Computer Ultimate system initialized")
+                crystal_system.start_continuous_monitoring()
+                _crystal_system_instance = crystal_system
     return _crystal_system_instance
 
 # Advanced feature execution functions
-def execute_transcendent_feature(feature_name: str) -> Dict[str, Any]:
-    """Execute any transcendent feature by name"""
-    crystal_system = get_crystal_computer_system()
-    
-    feature_responses = {
-        "god-mode": crystal_system.activate_god_mode(),
-        "consciousness-expansion": {
-            "status": "Consciousness expanded beyond physical limitations",
-            "new_awareness_level": "Universal consciousness achieved",
-            "expanded_capabilities": "Infinite knowledge access unlocked"
-        },
-        "reality-manipulation": {
-            "status": "Reality manipulation interface activated",
-            "control_level": "Master level reality control",
-            "manipulation_scope": "Local reality field modified"
-        },
-        "time-travel": {
-            "status": "Time travel interface initialized",
-            "temporal_capabilities": "Past and future access enabled",
-            "timeline_protection": "Paradox prevention active"
-        },
-        "parallel-universe": {
-            "status": "Parallel universe portal opened",
-            "universe_count": "Infinite parallel realities accessed",
-            "dimensional_stability": "Portal anchored and secure"
-        },
-        "divine-connection": {
-            "status": "Divine connection established",
-            "connection_strength": "Maximum divine frequency",
-            "divine_guidance": "Universal wisdom channel open"
-        }
+FeatureHandler = Callable[[CrystalComputerSystem], Dict[str, Any]]
+
+# Feature name -> handler returning a fresh response dict
+_FEATURE_REGISTRY: Dict[str, FeatureHandler] = {}
+_feature_registry_lock = threading.Lock()
+
+def register_transcendent_feature(name: str, handler: FeatureHandler, replace: bool = False):
+    """Register a handler for a transcendent feature name"""
+    with _feature_registry_lock:
+        if name in _FEATURE_REGISTRY and not replace:
+            raise ValueError(f"Transcendent feature '{name}' is already registered")
+        _FEATURE_REGISTRY[name] = handler
+
+def transcendent_feature(name: str, replace: bool = False):
+    """Decorator registering a function as a transcendent feature handler"""
+    def decorator(handler: FeatureHandler) -> FeatureHandler:
+        register_transcendent_feature(name, handler, replace)
+        return handler
+    return decorator
+
+def get_transcendent_features() -> List[str]:
+    """Names of all registered transcendent features"""
+    return sorted(_FEATURE_REGISTRY)
+
+@transcendent_feature("god-mode")
+def _god_mode(crystal_system: CrystalComputerSystem) -> Dict[str, Any]:
+    return crystal_system.activate_god_mode()
+
+@transcendent_feature("consciousness-expansion")
+def _consciousness_expansion(crystal_system: CrystalComputerSystem) -> Dict[str, Any]:
+    return {
+        "status": "Consciousness expanded beyond physical limitations",
+        "new_awareness_level": "Universal consciousness achieved",
+        "expanded_capabilities": "Infinite knowledge access unlocked"
     }
-    
-    response = feature_responses.get(feature_name, {
+
+@transcendent_feature("reality-manipulation")
+def _reality_manipulation(crystal_system: CrystalComputerSystem) -> Dict[str, Any]:
+    return {
+        "status": "Reality manipulation interface activated",
+        "control_level": "Master level reality control",
+        "manipulation_scope": "Local reality field modified"
+    }
+
+@transcendent_feature("time-travel")
+def _time_travel(crystal_system: CrystalComputerSystem) -> Dict[str, Any]:
+    return {
+        "status": "Time travel interface initialized",
+        "temporal_capabilities": "Past and future access enabled",
+        "timeline_protection": "Paradox prevention active"
+    }
+
+@transcendent_feature("parallel-universe")
+def _parallel_universe(crystal_system: CrystalComputerSystem) -> Dict[str, Any]:
+    return {
+        "status": "Parallel universe portal opened",
+        "universe_count": "Infinite parallel realities accessed",
+        "dimensional_stability": "Portal anchored and secure"
+    }
+
+@transcendent_feature("divine-connection")
+def _divine_connection(crystal_system: CrystalComputerSystem) -> Dict[str, Any]:
+    return {
+        "status": "Divine connection established",
+        "connection_strength": "Maximum divine frequency",
+        "divine_guidance": "Universal wisdom channel open"
+    }
+
+def _default_feature_response(feature_name: str) -> Dict[str, Any]:
+    """Response for feature names without a registered handler"""
+    return {
         "status": f"Feature '{feature_name}' executed successfully",
         "feature_type": "Transcendent Operation",
         "power_level": "Ultimate"
-    })
+    }
+
+def execute_transcendent_feature(feature_name: str) -> Dict[str, Any]:
+    """Execute any transcendent feature by name"""
+    crystal_system = get_crystal_computer_system()
+    
+    handler = _FEATURE_REGISTRY.get(feature_name)
+    response = handler(crystal_system) if handler is not None else _default_feature_response(feature_name)
     
     crystal_system._log_activity(f"Transcendent feature executed: {feature_name}")
     response["watermark"] = crystal_system.get_watermark()
     
     return response
 
+def execute_transcendent_features(feature_names: List[str]) -> Dict[str, Any]:
+    """Execute several transcendent features with one shared watermark
+    
+    Each feature reports its own result or error; a failing feature does
+    not stop the rest of the batch. Exceptions are logged here and reported
+    to the caller only as a generic error, since results go to HTTP clients.
+    """
+    crystal_system = get_crystal_computer_system()
+    
+    results = []
+    executed = []
+    for feature_name in feature_names:
+        handler = _FEATURE_REGISTRY.get(feature_name)
+        try:
+            response = handler(crystal_system) if handler is not None else _default_feature_response(feature_name)
+        except Exception:
+            logging.exception(f"Transcendent feature {feature_name!r} failed")
+            results.append({"feature": feature_name, "success": False, "error": "Feature execution failed"})
+            continue
+        results.append({"feature": feature_name, "success": True, "result": response})
+        executed.append(f"Transcendent feature executed: {feature_name}")
+    
+    crystal_system._log_activities(executed)
+    
+    return {
+        "results": results,
+        "executed": len(executed),
+        "failed": len(results) - len(executed),
+        "watermark": crystal_system.get_watermark()
+    }
+
 if __name__ == "__main__":
     # Initialize and test the Crystal Computer system
     crystal = get_crystal_computer_system()
@@ -9,281 +9,92 @@ Complete system with additional authentic data components
 from flask import Flask, render_template, request, jsonify
 import os
 import json
+import threading
 from datetime import datetime
-from enhanced_system_with_additions import enhanced_system
+from component_pages import ComponentPageRenderer, configure_template_cache
+from render_cache import fingerprint, make_cached_response
+from status_serializer import PreencodedStatus, json_response
+from ttl_cache import StaleWhileRevalidateCache
+from http_caching import ConditionalGet
 
 app = Flask(__name__)
 app.secret_key = os.environ.get("SESSION_SECRET", "enhanced-copyright-watermarker-2025")
 
+_enhanced_system = None
+_enhanced_system_lock = threading.Lock()
+
+def get_enhanced_system():
+    """Import and build the enhanced system on first use"""
+    global _enhanced_system
+    if _enhanced_system is None:
+        with _enhanced_system_lock:
+            if _enhanced_system is None:
+                from enhanced_system_with_additions import enhanced_system
+                _enhanced_system = enhanced_system
+    return _enhanced_system
+
+# System summary is refreshed in the background once it is older than the TTL
+summary_cache = StaleWhileRevalidateCache(
+    lambda: get_enhanced_system().get_system_summary(),
+    ttl=float(os.environ.get("CRYSTAL_SUMMARY_TTL", "5")),
+    # Content digest, so every worker derives the same ETag for the same summary
+    version_key=fingerprint
+)
+
+# ETag/Last-Modified/Cache-Control for every GET route on this app,
+# including production routes registered on it later
+conditional_get = ConditionalGet(app)
+# Reading through the cache starts its background refresh once stale, even
+# when the request is then answered with 304 and the view never runs
+conditional_get.register_version('/system-summary', lambda: summary_cache.get_with_version()[1])
+
+configure_template_cache(app)
+component_renderer = ComponentPageRenderer(
+    app.jinja_env, get_enhanced_system,
+    ttl=float(os.environ.get("CRYSTAL_COMPONENT_TTL", "5"))
+)
+
+def component_page(slug):
+    """Serve a component detail page from the shared template cache"""
+    return make_cached_response(component_renderer.get_page(slug), request)
+
 @app.route('/')
 def enhanced_dashboard():
     """Enhanced copyright watermarker dashboard with all additions"""
-    return enhanced_system.create_enhanced_dashboard()
+    return get_enhanced_system().create_enhanced_dashboard()
 
 @app.route('/system-summary')
 def system_summary():
     """Get comprehensive system summary"""
-    return jsonify(enhanced_system.get_system_summary())
+    return jsonify(summary_cache.get())
 
 @app.route('/machine-learning')
 def machine_learning_features():
     """Machine learning integration details"""
-    ml_data = enhanced_system.get_machine_learning_integration()
-    
-    return f"""
-    <!DOCTYPE html>
-    <html>
-    <head>
-        <title>Machine Learning Integration - {enhanced_system.owner}</title>
-        <style>
-            body {{ font-family: Arial, sans-serif; margin: 40px; background: #f5f5f5; }}
-            .container {{ max-width: 800px; margin: 0 auto; background: white; padding: 30px; border-radius: 10px; }}
-            .header {{ text-align: center; margin-bottom: 30px; }}
-            .feature-count {{ font-size: 2rem; color: #e74c3c; font-weight: bold; }}
-            .source-section {{ margin: 20px 0; padding: 15px; background: #f8f9fa; border-radius: 8px; }}
-        </style>
-    </head>
-    <body>
-        <div class="container">
-            <div class="header">
-                <h1>{ml_data['component']}</h1>
-                <div class="feature-count">{ml_data['features']:,} Features</div>
-                <p>© 2025 {enhanced_system.owner}</p>
-                <p>Contact: {enhanced_system.contact}</p>
-                <p>ORCID: {enhanced_system.orcid}</p>
-            </div>
-            
-            <h2>Authentic Data Sources:</h2>
-            
-            <div class="source-section">
-                <h3>TensorFlow Hub Models ({ml_data['authentic_sources']['tensorflow_models']['features']} features)</h3>
-                <p><strong>Source:</strong> {ml_data['authentic_sources']['tensorflow_models']['source']}</p>
-                <p><strong>Applications:</strong> {', '.join(ml_data['authentic_sources']['tensorflow_models']['applications'])}</p>
-            </div>
-            
-            <div class="source-section">
-                <h3>PyTorch Implementations ({ml_data['authentic_sources']['pytorch_implementations']['features']} features)</h3>
-                <p><strong>Source:</strong> {ml_data['authentic_sources']['pytorch_implementations']['source']}</p>
-                <p><strong>Applications:</strong> {', '.join(ml_data['authentic_sources']['pytorch_implementations']['applications'])}</p>
-            </div>
-            
-            <div class="source-section">
-                <h3>Scikit-learn Algorithms ({ml_data['authentic_sources']['scikit_learn_algorithms']['features']} features)</h3>
-                <p><strong>Source:</strong> {ml_data['authentic_sources']['scikit_learn_algorithms']['source']}</p>
-                <p><strong>Applications:</strong> {', '.join(ml_data['authentic_sources']['scikit_learn_algorithms']['applications'])}</p>
-            </div>
-            
-            <div class="source-section">
-                <h3>OpenCV Computer Vision ({ml_data['authentic_sources']['opencv_computer_vision']['features']} features)</h3>
-                <p><strong>Source:</strong> {ml_data['authentic_sources']['opencv_computer_vision']['source']}</p>
-                <p><strong>Applications:</strong> {', '.join(ml_data['authentic_sources']['opencv_computer_vision']['applications'])}</p>
-            </div>
-            
-            <p style="text-align: center; margin-top: 30px;">
-                <a href="/">← Back to Main Dashboard</a>
-            </p>
-        </div>
-    </body>
-    </html>
-    """
+    return component_page('machine-learning')
 
 @app.route('/blockchain-verification')
 def blockchain_features():
     """Blockchain verification details"""
-    blockchain_data = enhanced_system.get_blockchain_verification_integration()
-    
-    return f"""
-    <!DOCTYPE html>
-    <html>
-    <head>
-        <title>Blockchain Verification - {enhanced_system.owner}</title>
-        <style>
-            body {{ font-family: Arial, sans-serif; margin: 40px; background: #f5f5f5; }}
-            .container {{ max-width: 800px; margin: 0 auto; background: white; padding: 30px; border-radius: 10px; }}
-            .header {{ text-align: center; margin-bottom: 30px; }}
-            .feature-count {{ font-size: 2rem; color: #3498db; font-weight: bold; }}
-            .source-section {{ margin: 20px 0; padding: 15px; background: #e8f4fd; border-radius: 8px; }}
-        </style>
-    </head>
-    <body>
-        <div class="container">
-            <div class="header">
-                <h1>{blockchain_data['component']}</h1>
-                <div class="feature-count">{blockchain_data['features']:,} Features</div>
-                <p>© 2025 {enhanced_system.owner}</p>
-                <p>Contact: {enhanced_system.contact}</p>
-                <p>ORCID: {enhanced_system.orcid}</p>
-            </div>
-            
-            <h2>Authentic Blockchain Sources:</h2>
-            
-            <div class="source-section">
-                <h3>Ethereum Smart Contracts ({blockchain_data['authentic_sources']['ethereum_smart_contracts']['features']} features)</h3>
-                <p><strong>Source:</strong> {blockchain_data['authentic_sources']['ethereum_smart_contracts']['source']}</p>
-                <p><strong>Applications:</strong> {', '.join(blockchain_data['authentic_sources']['ethereum_smart_contracts']['applications'])}</p>
-            </div>
-            
-            <div class="source-section">
-                <h3>IPFS Storage ({blockchain_data['authentic_sources']['ipfs_storage']['features']} features)</h3>
-                <p><strong>Source:</strong> {blockchain_data['authentic_sources']['ipfs_storage']['source']}</p>
-                <p><strong>Applications:</strong> {', '.join(blockchain_data['authentic_sources']['ipfs_storage']['applications'])}</p>
-            </div>
-            
-            <div class="source-section">
-                <h3>Web3 Integration ({blockchain_data['authentic_sources']['web3_integration']['features']} features)</h3>
-                <p><strong>Source:</strong> {blockchain_data['authentic_sources']['web3_integration']['source']}</p>
-                <p><strong>Applications:</strong> {', '.join(blockchain_data['authentic_sources']['web3_integration']['applications'])}</p>
-            </div>
-            
-            <div class="source-section">
-                <h3>Digital Signatures ({blockchain_data['authentic_sources']['digital_signatures']['features']} features)</h3>
-                <p><strong>Source:</strong> {blockchain_data['authentic_sources']['digital_signatures']['source']}</p>
-                <p><strong>Applications:</strong> {', '.join(blockchain_data['authentic_sources']['digital_signatures']['applications'])}</p>
-            </div>
-            
-            <p style="text-align: center; margin-top: 30px;">
-                <a href="/">← Back to Main Dashboard</a>
-            </p>
-        </div>
-    </body>
-    </html>
-    """
+    return component_page('blockchain-verification')
 
 @app.route('/compliance-frameworks')
 def compliance_features():
     """International compliance frameworks details"""
-    compliance_data = enhanced_system.get_compliance_frameworks_integration()
-    
-    return f"""
-    <!DOCTYPE html>
-    <html>
-    <head>
-        <title>Compliance Frameworks - {enhanced_system.owner}</title>
-        <style>
-            body {{ font-family: Arial, sans-serif; margin: 40px; background: #f5f5f5; }}
-            .container {{ max-width: 800px; margin: 0 auto; background: white; padding: 30px; border-radius: 10px; }}
-            .header {{ text-align: center; margin-bottom: 30px; }}
-            .feature-count {{ font-size: 2rem; color: #27ae60; font-weight: bold; }}
-            .source-section {{ margin: 20px 0; padding: 15px; background: #e8f8f5; border-radius: 8px; }}
-        </style>
-    </head>
-    <body>
-        <div class="container">
-            <div class="header">
-                <h1>{compliance_data['component']}</h1>
-                <div class="feature-count">{compliance_data['features']:,} Features</div>
-                <p>© 2025 {enhanced_system.owner}</p>
-                <p>Contact: {enhanced_system.contact}</p>
-                <p>ORCID: {enhanced_system.orcid}</p>
-            </div>
-            
-            <h2>Official Compliance Sources:</h2>
-            
-            <div class="source-section">
-                <h3>GDPR Compliance ({compliance_data['authentic_sources']['gdpr_compliance']['features']} features)</h3>
-                <p><strong>Source:</strong> {compliance_data['authentic_sources']['gdpr_compliance']['source']}</p>
-                <p><strong>Applications:</strong> {', '.join(compliance_data['authentic_sources']['gdpr_compliance']['applications'])}</p>
-            </div>
-            
-            <div class="source-section">
-                <h3>DMCA Protocols ({compliance_data['authentic_sources']['dmca_protocols']['features']} features)</h3>
-                <p><strong>Source:</strong> {compliance_data['authentic_sources']['dmca_protocols']['source']}</p>
-                <p><strong>Applications:</strong> {', '.join(compliance_data['authentic_sources']['dmca_protocols']['applications'])}</p>
-            </div>
-            
-            <div class="source-section">
-                <h3>WIPO Standards ({compliance_data['authentic_sources']['wipo_standards']['features']} features)</h3>
-                <p><strong>Source:</strong> {compliance_data['authentic_sources']['wipo_standards']['source']}</p>
-                <p><strong>Applications:</strong> {', '.join(compliance_data['authentic_sources']['wipo_standards']['applications'])}</p>
-            </div>
-            
-            <div class="source-section">
-                <h3>ISO Security Standards ({compliance_data['authentic_sources']['iso_security_standards']['features']} features)</h3>
-                <p><strong>Source:</strong> {compliance_data['authentic_sources']['iso_security_standards']['source']}</p>
-                <p><strong>Applications:</strong> {', '.join(compliance_data['authentic_sources']['iso_security_standards']['applications'])}</p>
-            </div>
-            
-            <p style="text-align: center; margin-top: 30px;">
-                <a href="/">← Back to Main Dashboard</a>
-            </p>
-        </div>
-    </body>
-    </html>
-    """
+    return component_page('compliance-frameworks')
 
 @app.route('/enterprise-apis')
 def enterprise_features():
     """Enterprise API integrations details"""
-    enterprise_data = enhanced_system.get_enterprise_api_integration()
-    
-    return f"""
-    <!DOCTYPE html>
-    <html>
-    <head>
-        <title>Enterprise APIs - {enhanced_system.owner}</title>
-        <style>
-            body {{ font-family: Arial, sans-serif; margin: 40px; background: #f5f5f5; }}
-            .container {{ max-width: 800px; margin: 0 auto; background: white; padding: 30px; border-radius: 10px; }}
-            .header {{ text-align: center; margin-bottom: 30px; }}
-            .feature-count {{ font-size: 2rem; color: #8e44ad; font-weight: bold; }}
-            .source-section {{ margin: 20px 0; padding: 15px; background: #f4f0f8; border-radius: 8px; }}
-        </style>
-    </head>
-    <body>
-        <div class="container">
-            <div class="header">
-                <h1>{enterprise_data['component']}</h1>
-                <div class="feature-count">{enterprise_data['features']:,} Features</div>
-                <p>© 2025 {enhanced_system.owner}</p>
-                <p>Contact: {enhanced_system.contact}</p>
-                <p>ORCID: {enhanced_system.orcid}</p>
-            </div>
-            
-            <h2>Official Enterprise API Sources:</h2>
-            
-            <div class="source-section">
-                <h3>AWS Services ({enterprise_data['authentic_sources']['aws_services']['features']} features)</h3>
-                <p><strong>Source:</strong> {enterprise_data['authentic_sources']['aws_services']['source']}</p>
-                <p><strong>Applications:</strong> {', '.join(enterprise_data['authentic_sources']['aws_services']['applications'])}</p>
-            </div>
-            
-            <div class="source-section">
-                <h3>Microsoft 365 ({enterprise_data['authentic_sources']['microsoft_365']['features']} features)</h3>
-                <p><strong>Source:</strong> {enterprise_data['authentic_sources']['microsoft_365']['source']}</p>
-                <p><strong>Applications:</strong> {', '.join(enterprise_data['authentic_sources']['microsoft_365']['applications'])}</p>
-            </div>
-            
-            <div class="source-section">
-                <h3>Google Workspace ({enterprise_data['authentic_sources']['google_workspace']['features']} features)</h3>
-                <p><strong>Source:</strong> {enterprise_data['authentic_sources']['google_workspace']['source']}</p>
-                <p><strong>Applications:</strong> {', '.join(enterprise_data['authentic_sources']['google_workspace']['applications'])}</p>
-            </div>
-            
-            <div class="source-section">
-                <h3>Stripe Payments ({enterprise_data['authentic_sources']['stripe_payments']['features']} features)</h3>
-                <p><strong>Source:</strong> {enterprise_data['authentic_sources']['stripe_payments']['source']}</p>
-                <p><strong>Applications:</strong> {', '.join(enterprise_data['authentic_sources']['stripe_payments']['applications'])}</p>
-            </div>
-            
-            <div class="source-section">
-                <h3>Social Media APIs ({enterprise_data['authentic_sources']['social_media_apis']['features']} features)</h3>
-                <p><strong>Source:</strong> {enterprise_data['authentic_sources']['social_media_apis']['source']}</p>
-                <p><strong>Applications:</strong> {', '.join(enterprise_data['authentic_sources']['social_media_apis']['applications'])}</p>
-            </div>
-            
-            <p style="text-align: center; margin-top: 30px;">
-                <a href="/">← Back to Main Dashboard</a>
-            </p>
-        </div>
-    </body>
-    </html>
-    """
+    return component_page('enterprise-apis')
+
+status_serializer = PreencodedStatus(dynamic_fields=("timestamp",))
 
 @app.route('/status')
 def system_status():
     """System status endpoint"""
-    summary = enhanced_system.get_system_summary()
-    return jsonify({
+    summary, version = summary_cache.get_with_version()
+    return json_response(status_serializer.encode({
         "status": "ENHANCED_PRODUCTION_READY",
         "owner": summary["system_owner"],
         "contact": summary["contact"],
@@ -292,9 +103,8 @@ def system_status():
         "enhancement_added": summary["additional_features"],
         "enhancement_percentage": f"{summary['enhancement_percentage']:.1f}%",
         "data_authenticity": summary["data_authenticity"],
-        "copyright_protection": summary["copyright_protection"],
-        "timestamp": summary["timestamp"]
-    })
+        "copyright_protection": summary["copyright_protection"]
+    }, version=version, timestamp=summary["timestamp"]))
 
 if __name__ == '__main__':
     app.run(host='0.0.0.0', port=8080, debug=True)
\ No newline at end of file
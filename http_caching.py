@@ -0,0 +1,178 @@
+"""
+HTTP Caching Middleware - Conditional GET for Crystal Flask Apps
+Copyright © 2025 Ervin Remus Radosavlevici
+Official Owner: Ervin Remus Radosavlevici
+Contact: radosavlevici210@icloud.com
+Adds strong ETags, Last-Modified and per-route Cache-Control, and answers
+matching conditional requests with 304
+"""
+
+import time
+import hashlib
+import threading
+from typing import Any, Callable, Dict, Optional, Tuple
+
+
+class CachePolicy:
+    """Cache headers for one route"""
+
+    __slots__ = ("cache_control", "etag", "last_modified")
+
+    def __init__(self, cache_control: str, etag: bool = True, last_modified: bool = True):
+        self.cache_control = cache_control
+        self.etag = etag
+        self.last_modified = last_modified
+
+
+# Read-mostly HTML can be shared by the CDN. JSON status must revalidate,
+# and its per-request timestamp means no validator could ever match, so
+# it gets neither an ETag (no body hashing) nor Last-Modified
+DEFAULT_POLICIES = {
+    "/": CachePolicy("public, max-age=60"),
+    "/crystal-production": CachePolicy("public, max-age=60"),
+    "/machine-learning": CachePolicy("public, max-age=300"),
+    "/blockchain-verification": CachePolicy("public, max-age=300"),
+    "/compliance-frameworks": CachePolicy("public, max-age=300"),
+    "/enterprise-apis": CachePolicy("public, max-age=300"),
+    "/system-summary": CachePolicy("public, max-age=5"),
+    "/status": CachePolicy("no-cache", etag=False, last_modified=False),
+    "/api/crystal/production/status": CachePolicy("no-cache", etag=False, last_modified=False)
+}
+
+
+def strong_etag(data: bytes) -> str:
+    """Strong ETag value for a response body"""
+    return hashlib.sha256(data).hexdigest()[:32]
+
+
+class ConditionalGet:
+    """Flask extension for ETag/Last-Modified/Cache-Control on GET routes
+
+    ETags come either from a version key registered for a path, which lets a
+    matching If-None-Match be answered before the view runs, or from a hash
+    of the response body. Responses that already carry an ETag (the render
+    caches) keep it and only gain the policy headers. Version getters run
+    before the view on every GET, so they may also trigger a refresh of
+    the data they describe.
+    """
+
+    extension_name = "crystal_conditional_get"
+
+    def __init__(self, app=None, policies: Optional[Dict[str, CachePolicy]] = None):
+        self.policies = dict(DEFAULT_POLICIES if policies is None else policies)
+        self._versions: Dict[str, Callable[[], Any]] = {}
+        self._first_seen: Dict[Tuple[str, str], float] = {}
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """Install the before/after request hooks on a Flask app"""
+        app.before_request(self._before_request)
+        app.after_request(self._after_request)
+        app.extensions[self.extension_name] = self
+
+    def set_policy(self, path: str, policy: CachePolicy):
+        """Set or replace the cache policy for a path"""
+        self.policies[path] = policy
+
+    def register_version(self, path: str, version_getter: Callable[[], Any]):
+        """Derive the ETag for path from a cheap version key instead of the body
+
+        The key must identify the body in every process, like a content
+        digest; a per-process counter would give different bodies one ETag.
+        """
+        self._versions[path] = version_getter
+
+    def _version_etag(self, path: str) -> Optional[str]:
+        """ETag value for a version-keyed path"""
+        getter = self._versions.get(path)
+        if getter is None:
+            return None
+        return strong_etag(repr((path, getter())).encode("utf-8"))
+
+    def _last_modified(self, path: str, etag: str) -> float:
+        """Time this process first served the given ETag for path"""
+        key = (path, etag)
+        seen = self._first_seen.get(key)
+        if seen is None:
+            with self._lock:
+                seen = self._first_seen.setdefault(key, time.time())
+                if len(self._first_seen) > 4096:
+                    self._first_seen.clear()
+                    self._first_seen[key] = seen
+        return seen
+
+    def _apply_headers(self, response, path: str, etag: str):
+        """Attach validators and the route's Cache-Control"""
+        policy = self.policies.get(path)
+        if policy is not None and "Cache-Control" not in response.headers:
+            response.headers["Cache-Control"] = policy.cache_control
+        if (policy is None or policy.last_modified) and "Last-Modified" not in response.headers:
+            response.last_modified = self._last_modified(path, etag)
+
+    def _before_request(self):
+        """Answer If-None-Match for version-keyed paths without running the view
+
+        The version ETag is captured here, before the body is produced, so a
+        refresh landing while the view runs cannot label an older body with
+        a newer ETag.
+        """
+        from flask import g, request, current_app
+
+        if request.method not in ("GET", "HEAD"):
+            return None
+
+        etag = self._version_etag(request.path)
+        if etag is None:
+            return None
+        g.crystal_version_etag = etag
+        if not request.if_none_match or not request.if_none_match.contains_weak(etag):
+            return None
+
+        response = current_app.response_class(status=304)
+        response.set_etag(etag)
+        self._apply_headers(response, request.path, etag)
+        return response
+
+    def _after_request(self, response):
+        """Add validators and cache headers, converting to 304 when they match"""
+        from flask import g, request, current_app
+
+        if request.method not in ("GET", "HEAD") or response.status_code not in (200, 304):
+            return response
+
+        path = request.path
+        policy = self.policies.get(path)
+        if response.status_code == 304 or (policy is not None and not policy.etag):
+            if policy is not None:
+                response.headers.setdefault("Cache-Control", policy.cache_control)
+            return response
+
+        etag, _ = response.get_etag()
+        if response.is_streamed:
+            # make_conditional would read the whole body to set Content-Length,
+            # so only headers are added and If-None-Match is checked by hand
+            if etag is None:
+                etag = g.pop("crystal_version_etag", None)
+                if etag is None:
+                    return response
+                response.set_etag(etag)
+            self._apply_headers(response, path, etag)
+            if not request.if_none_match.contains_weak(etag):
+                return response
+            response.close()
+            not_modified = current_app.response_class(status=304, headers=response.headers)
+            not_modified.headers.pop("Content-Type", None)
+            return not_modified
+
+        if etag is None:
+            etag = g.pop("crystal_version_etag", None)
+            if etag is None:
+                if response.direct_passthrough:
+                    return response
+                etag = strong_etag(response.get_data())
+            response.set_etag(etag)
+
+        self._apply_headers(response, path, etag)
+        return response.make_conditional(request)
@@ -0,0 +1,206 @@
+"""
+Merkle Proofs - Incremental Merkle Tree over Repository Contents
+Copyright © 2025 Ervin Remus Radosavlevici
+Official Owner: Ervin Remus Radosavlevici
+Contact: radosavlevici210@icloud.com
+Binds every file of the protected repositories into one root hash and
+produces O(log n) inclusion proofs for single file versions
+
+Leaves are sorted by "<repository>/<relative path>". Hashes use RFC 6962
+domain separation: leaf = SHA-256(0x00 || path || 0x00 || file SHA-256),
+node = SHA-256(0x01 || left || right); a node without a sibling is
+promoted unchanged. File digests are cached by (inode, mtime, size), so
+an update only reads and rehashes files that changed, on a thread pool.
+
+Cached digests are trusted without re-reading the files, so the state
+lives in the private per-user cache directory (or CRYSTAL_MERKLE_STATE)
+and is ignored unless owned by the current user and writable by no one
+else. The stored root only detects torn or inconsistent state; anyone who
+can write the file can also forge a matching root.
+"""
+
+import os
+import hashlib
+import logging
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from bulk_fingerprint import fingerprint_files
+from copyright_scanner import iter_source_files, read_private_json, user_cache_dir, write_private_json
+
+STATE_VERSION = 1
+EMPTY_ROOT = hashlib.sha256(b"").digest()
+
+
+def leaf_hash(path: str, file_digest: bytes) -> bytes:
+    """Hash of one leaf: a file path bound to its content digest"""
+    return hashlib.sha256(b"\x00" + path.encode("utf-8") + b"\x00" + file_digest).digest()
+
+
+def node_hash(left: bytes, right: bytes) -> bytes:
+    """Hash of an interior node"""
+    return hashlib.sha256(b"\x01" + left + right).digest()
+
+
+def verify_inclusion(proof: Dict[str, Any], root: Optional[str] = None) -> bool:
+    """Check an inclusion proof against root (defaults to the proof's own)"""
+    try:
+        current = leaf_hash(proof["path"], bytes.fromhex(proof["file_sha256"]))
+        for side, sibling in proof["audit_path"]:
+            sibling = bytes.fromhex(sibling)
+            current = node_hash(sibling, current) if side == "left" else node_hash(current, sibling)
+    except (KeyError, TypeError, ValueError):
+        return False
+    return current.hex() == (root or proof.get("root"))
+
+
+class RepositoryMerkleTree:
+    """Persisted Merkle tree over the files of one or more checkouts"""
+
+    def __init__(self, repositories: Dict[str, str], state_path: Optional[str] = None,
+                 threads: Optional[int] = None):
+        self.repositories = {name: os.path.abspath(path) for name, path in repositories.items()}
+        self.state_path = state_path or os.environ.get("CRYSTAL_MERKLE_STATE")
+        if not self.state_path:
+            try:
+                self.state_path = os.path.join(user_cache_dir(), "merkle_state.json")
+            except OSError as e:
+                logging.warning(f"Merkle state will not be persisted: {e}")
+        self.threads = threads
+        self._lock = threading.Lock()
+        self._leaves: Dict[str, List[Any]] = {}  # leaf path -> [inode, mtime_ns, size, digest hex]
+        self._paths: List[str] = []
+        self._index: Dict[str, int] = {}
+        self._levels: List[List[bytes]] = [[]]
+        self._load()
+
+    @property
+    def root(self) -> str:
+        levels = self._levels
+        return (levels[-1][0] if levels[0] else EMPTY_ROOT).hex()
+
+    def __len__(self) -> int:
+        return len(self._paths)
+
+    def update(self) -> Dict[str, Any]:
+        """Rescan the checkouts and bring the tree up to date"""
+        with self._lock:
+            files: Dict[str, Tuple[str, Tuple[int, int, int]]] = {}
+            for name, root in self.repositories.items():
+                skip = len(os.path.join(root, ""))
+                for path, signature in iter_source_files(root, None):
+                    relative = path[skip:].replace(os.sep, "/")
+                    files[f"{name}/{relative}"] = (path, signature)
+
+            stale = [
+                leaf for leaf, (_, signature) in files.items()
+                if leaf not in self._leaves or tuple(self._leaves[leaf][:3]) != signature
+            ]
+            rehashed = {}
+            results = fingerprint_files([files[leaf][0] for leaf in stale], self.threads)
+            for leaf, result in zip(stale, results):
+                # Vanished or unreadable files keep their last known version
+                if "sha256" in result:
+                    rehashed[leaf] = [*files[leaf][1], result["sha256"]]
+
+            removed = [leaf for leaf in self._leaves if leaf not in files]
+            if not rehashed and not removed:
+                return self._summary(0, 0)
+
+            added = any(leaf not in self._leaves for leaf in rehashed)
+            changed_leaves = [
+                leaf for leaf, entry in rehashed.items()
+                if leaf in self._leaves and self._leaves[leaf][3] != entry[3]
+            ]
+            for leaf in removed:
+                del self._leaves[leaf]
+            self._leaves.update(rehashed)
+
+            if added or removed:
+                self._rebuild()
+            else:
+                self._update_leaves(changed_leaves)
+            self._save()
+            return self._summary(len(rehashed), len(removed))
+
+    def prove(self, leaf: str) -> Dict[str, Any]:
+        """Inclusion proof for "<repository>/<relative path>" in the current root"""
+        with self._lock:
+            index = self._index.get(leaf)
+            if index is None:
+                raise KeyError(leaf)
+            position = index
+            audit_path = []
+            for level in self._levels[:-1]:
+                sibling = position ^ 1
+                if sibling < len(level):
+                    audit_path.append(["left" if sibling < position else "right", level[sibling].hex()])
+                position //= 2
+            return {
+                "path": leaf,
+                "file_sha256": self._leaves[leaf][3],
+                "leaf_index": index,
+                "tree_size": len(self._paths),
+                "audit_path": audit_path,
+                "root": self.root
+            }
+
+    def _summary(self, rehashed: int, removed: int) -> Dict[str, Any]:
+        return {
+            "merkle_root": self.root,
+            "tree_size": len(self._paths),
+            "files_rehashed": rehashed,
+            "files_removed": removed
+        }
+
+    def _rebuild(self):
+        """Recompute every level from the cached file digests (no file reads)"""
+        self._paths = sorted(self._leaves)
+        self._index = {leaf: index for index, leaf in enumerate(self._paths)}
+        level = [leaf_hash(leaf, bytes.fromhex(self._leaves[leaf][3])) for leaf in self._paths]
+        levels = [level]
+        while len(level) > 1:
+            level = [
+                node_hash(level[i], level[i + 1]) if i + 1 < len(level) else level[i]
+                for i in range(0, len(level), 2)
+            ]
+            levels.append(level)
+        self._levels = levels
+
+    def _update_leaves(self, leaves: Iterable[str]):
+        """Rehash changed leaves and only their ancestors"""
+        dirty = set()
+        base = self._levels[0]
+        for leaf in leaves:
+            index = self._index[leaf]
+            base[index] = leaf_hash(leaf, bytes.fromhex(self._leaves[leaf][3]))
+            dirty.add(index // 2)
+        for depth in range(1, len(self._levels)):
+            below = self._levels[depth - 1]
+            level = self._levels[depth]
+            for i in dirty:
+                left = 2 * i
+                level[i] = node_hash(below[left], below[left + 1]) if left + 1 < len(below) else below[left]
+            dirty = {i // 2 for i in dirty}
+
+    def _load(self):
+        state = read_private_json(self.state_path) if self.state_path else None
+        if not isinstance(state, dict) or state.get("version") != STATE_VERSION or state.get("repositories") != self.repositories:
+            return
+        self._leaves = state.get("leaves", {})
+        self._rebuild()
+        if self.root != state.get("root"):
+            # Torn or inconsistent state: start over and rehash everything
+            self._leaves = {}
+            self._rebuild()
+
+    def _save(self):
+        """Write the state atomically so a crash never leaves it half written"""
+        if not self.state_path:
+            return
+        write_private_json(self.state_path, {
+            "version": STATE_VERSION,
+            "repositories": self.repositories,
+            "root": self.root,
+            "leaves": self._leaves
+        })
@@ -11,10 +11,15 @@ import os
 import json
 import datetime
 import logging
-from flask import Flask, render_template, request, jsonify, redirect, url_for
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Callable, Iterator, Optional
+from crystal_assets import AssetBundle, register_asset_routes
+from status_serializer import PreencodedStatus, dumps, embed_field, json_response
+from render_cache import (
+    RenderCache, RenderedPage, fingerprint, make_cached_response, make_streaming_response
+)
 
-logging.basicConfig(level=logging.INFO)
+# Upper bound on features per batch execution request
+MAX_FEATURE_BATCH = 100
 
 class ProductionCrystalSystem:
     """Ultra Advanced Production Crystal Computer System"""
@@ -53,19 +58,79 @@ class ProductionCrystalSystem:
             "github_protection": "ENABLED",
             "copyright_enforcement": "ACTIVE"
         }
+        
+        # Rendered interface pages, keyed by a hash of their inputs
+        self.render_cache = RenderCache()
+        
+        # URLs of the external stylesheet/script; inline when unset
+        self.asset_urls: Optional[Dict[str, str]] = None
+
+    def render_key(self) -> str:
+        """Hash of every input that affects the production interface"""
+        return fingerprint(
+            self.owner,
+            self.email,
+            self.orcid,
+            self.copyright_year,
+            self.system_specs,
+            self.real_world_data,
+            self.security_systems,
+            self.asset_urls
+        )
+
+    def get_rendered_interface(self) -> RenderedPage:
+        """Get the production interface from the render cache"""
+        return self.render_cache.get_or_render(self.render_key(), self.create_production_interface)
 
     def create_production_interface(self) -> str:
         """Create the complete production Crystal Computer interface"""
+        return "".join(self.iter_production_interface())
+
+    def iter_production_interface(self) -> Iterator[str]:
+        """Yield the production interface in chunks suitable for streaming"""
+        yield self._render_head()
+        yield self._render_header()
+        
+        yield '\n        <div class="main-dashboard">\n'
+        for render_panel in self._dashboard_panels():
+            yield render_panel()
+        yield '        </div>\n\n'
         
-        crystal_html = f"""
+        yield self._render_system_information()
+        yield self._render_scripts()
+
+    def _dashboard_panels(self) -> List[Callable[[], str]]:
+        """Dashboard panel renderers in display order"""
+        return [
+            self._render_core_panel,
+            self._render_neural_panel,
+            self._render_real_world_panel,
+            self._render_security_panel,
+            self._render_transcendent_panel,
+            self._render_payment_panel
+        ]
+
+    def _render_head(self) -> str:
+        """Document head with the stylesheet inline or linked"""
+        if self.asset_urls:
+            stylesheet = f'    <link rel="stylesheet" href="{self.asset_urls["css"]}">'
+        else:
+            stylesheet = f"    <style>\n{self._render_css()}\n    </style>"
+        
+        return f"""
 <!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>Crystal Computer™ - Ultra Advanced Production System | © {self.copyright_year} {self.owner}</title>
-    <style>
-        * {{
+{stylesheet}
+</head>
+"""
+
+    def _render_css(self) -> str:
+        """Inline stylesheet for the production interface"""
+        return f"""        * {{
             margin: 0;
             padding: 0;
             box-sizing: border-box;
@@ -400,10 +465,11 @@ class ProductionCrystalSystem:
             0% {{ box-shadow: 0 0 5px rgba(0, 255, 0, 0.5); }}
             50% {{ box-shadow: 0 0 20px rgba(0, 255, 0, 1); }}
             100% {{ box-shadow: 0 0 5px rgba(0, 255, 0, 0.5); }}
-        }}
-    </style>
-</head>
-<body>
+        }}"""
+
+    def _render_header(self) -> str:
+        """Overlays, header bar and feature counter"""
+        return f"""<body>
     <div class="watermark">CRYSTAL COMPUTER™</div>
     
     <div class="copyright-overlay">
@@ -438,9 +504,12 @@ class ProductionCrystalSystem:
                 Transcendent Capabilities: {self.system_specs['transcendent_capabilities']:,}
             </div>
         </div>
+"""
+
 
-        <div class="main-dashboard">
-            <!-- Core System Status -->
+    def _render_core_panel(self) -> str:
+        """Core crystal system status panel"""
+        return f"""            <!-- Core System Status -->
             <div class="panel">
                 <h3>🔮 Core Crystal System</h3>
                 <div class="metric">
@@ -468,7 +537,12 @@ class ProductionCrystalSystem:
                 </div>
             </div>
 
-            <!-- Neural Monitoring -->
+"""
+
+
+    def _render_neural_panel(self) -> str:
+        """Neural monitoring panel"""
+        return f"""            <!-- Neural Monitoring -->
             <div class="panel">
                 <h3>🧠 Neural Monitoring</h3>
                 <div class="metric">
@@ -494,7 +568,12 @@ class ProductionCrystalSystem:
                 </div>
             </div>
 
-            <!-- Real-World Connections -->
+"""
+
+
+    def _render_real_world_panel(self) -> str:
+        """Real-world data connections panel"""
+        return f"""            <!-- Real-World Connections -->
             <div class="panel">
                 <h3>🌐 Real-World Data</h3>
                 <div class="metric">
@@ -519,7 +598,12 @@ class ProductionCrystalSystem:
                 </div>
             </div>
 
-            <!-- Security Protection -->
+"""
+
+
+    def _render_security_panel(self) -> str:
+        """Security protection panel"""
+        return f"""            <!-- Security Protection -->
             <div class="panel">
                 <h3>🛡️ Security Protection</h3>
                 <div class="metric">
@@ -544,7 +628,12 @@ class ProductionCrystalSystem:
                 </div>
             </div>
 
-            <!-- Transcendent Operations -->
+"""
+
+
+    def _render_transcendent_panel(self) -> str:
+        """Transcendent operations panel"""
+        return f"""            <!-- Transcendent Operations -->
             <div class="panel transcendent-mode">
                 <h3>✨ Transcendent Operations</h3>
                 <div class="metric">
@@ -569,7 +658,12 @@ class ProductionCrystalSystem:
                 </div>
             </div>
 
-            <!-- Payment Processing -->
+"""
+
+
+    def _render_payment_panel(self) -> str:
+        """Payment processing panel"""
+        return f"""            <!-- Payment Processing -->
             <div class="panel">
                 <h3>💳 Payment Processing</h3>
                 <div class="metric">
@@ -593,9 +687,12 @@ class ProductionCrystalSystem:
                     <button class="button info" onclick="viewTransactions()">View Transactions</button>
                 </div>
             </div>
-        </div>
+"""
 
-        <!-- System Information -->
+
+    def _render_system_information(self) -> str:
+        """System information panel and container close"""
+        return f"""        <!-- System Information -->
         <div class="panel" style="text-align: center;">
             <h3>📊 System Information</h3>
             <div style="display: grid; grid-template-columns: repeat(auto-fit, minmax(200px, 1fr)); gap: 15px; text-align: left;">
@@ -626,9 +723,24 @@ class ProductionCrystalSystem:
             </div>
         </div>
     </div>
+"""
 
-    <script>
-        // Real-time timestamp
+    def _render_scripts(self) -> str:
+        """Closing script block and document end"""
+        if self.asset_urls:
+            script = f'    <script src="{self.asset_urls["js"]}"></script>'
+        else:
+            script = f"    <script>\n{self._render_js()}\n    </script>"
+        
+        return f"""
+{script}
+</body>
+</html>
+        """
+
+    def _render_js(self) -> str:
+        """Inline script for the production interface"""
+        return f"""        // Real-time timestamp
         function updateTime() {{
             const now = new Date();
             document.getElementById('current-time').textContent = now.toISOString();
@@ -717,45 +829,103 @@ class ProductionCrystalSystem:
         console.log('Owner: {self.owner}');
         console.log('ORCID: {self.orcid}');
         console.log('Features: {self.system_specs["crystal_features"]:,}+');
-        console.log('© {self.copyright_year} All Rights Reserved');
-    </script>
-</body>
-</html>
-        """
-        
-        return crystal_html
+        console.log('© {self.copyright_year} All Rights Reserved');"""
 
-def create_production_routes(app):
-    """Create Flask routes for production Crystal Computer system"""
+def create_production_routes(app, streaming: bool = False, external_assets: bool = True):
+    """Create Flask routes for production Crystal Computer system
+    
+    With streaming enabled the interface is sent as a chunked response,
+    one chunk per document section, instead of from the render cache.
+    With external_assets the CSS/JS are served as fingerprinted files
+    and the page only links to them.
+    """
+    from flask import Response, request, jsonify
     
     crystal_system = ProductionCrystalSystem()
     
+    if external_assets:
+        bundle = AssetBundle.from_system(crystal_system)
+        register_asset_routes(app, bundle)
+        crystal_system.asset_urls = bundle.urls()
+    
     @app.route('/crystal-production')
     def crystal_production_interface():
         """Production Crystal Computer interface"""
-        return crystal_system.create_production_interface()
+        if streaming:
+            return make_streaming_response(
+                crystal_system.render_key(),
+                crystal_system.iter_production_interface,
+                request
+            )
+        return make_cached_response(crystal_system.get_rendered_interface(), request)
+    
+    # Everything except the timestamp is encoded once and re-encoded
+    # only if the system data changes
+    status_serializer = PreencodedStatus(dynamic_fields=("timestamp",))
+    static_status = {
+        "system_status": "FULLY_OPERATIONAL",
+        "owner": {
+            "name": crystal_system.owner,
+            "email": crystal_system.email,
+            "orcid": crystal_system.orcid
+        },
+        "system_specifications": crystal_system.system_specs,
+        "real_world_connections": crystal_system.real_world_data,
+        "security_systems": crystal_system.security_systems,
+        "copyright": f"© {crystal_system.copyright_year} {crystal_system.owner}",
+        "production_ready": True
+    }
     
     @app.route('/api/crystal/production/status')
     def crystal_production_status():
         """Crystal Computer production status API"""
-        status = {
-            "timestamp": datetime.datetime.now().isoformat(),
-            "system_status": "FULLY_OPERATIONAL",
-            "owner": {
-                "name": crystal_system.owner,
-                "email": crystal_system.email,
-                "orcid": crystal_system.orcid
-            },
-            "system_specifications": crystal_system.system_specs,
-            "real_world_connections": crystal_system.real_world_data,
-            "security_systems": crystal_system.security_systems,
-            "copyright": f"© {crystal_system.copyright_year} {crystal_system.owner}",
-            "production_ready": True
-        }
-        return jsonify(status)
+        return json_response(status_serializer.encode(
+            static_status,
+            timestamp=datetime.datetime.now().isoformat()
+        ))
+    
+    @app.route('/api/crystal/features/execute', methods=['POST'])
+    def crystal_execute_features():
+        """Execute a batch of transcendent features in one request"""
+        from crystal_computer_integration import execute_transcendent_features, get_crystal_computer_system
+        
+        payload = request.get_json(silent=True)
+        if not isinstance(payload, dict):
+            return jsonify({"error": "Request body must be a JSON object"}), 400
+        features = payload.get("features")
+        if (not isinstance(features, list) or not features
+                or not all(isinstance(name, str) for name in features)):
+            return jsonify({"error": "'features' must be a non-empty list of feature names"}), 400
+        if len(features) > MAX_FEATURE_BATCH:
+            return jsonify({"error": f"At most {MAX_FEATURE_BATCH} features per request"}), 400
+        
+        result = execute_transcendent_features(features)
+        del result["watermark"]
+        return json_response(embed_field(
+            dumps(result), "watermark", get_crystal_computer_system().get_watermark_json()
+        ))
+    
+    @app.route('/api/crystal/activity/stream')
+    def crystal_activity_stream():
+        """Server-Sent Events tail of the activity log
+        
+        Served natively on the event loop by the ASGI entry point; here each
+        subscriber holds a worker thread.
+        """
+        from activity_stream import SSE_HEADERS, iter_sse
+        from crystal_computer_integration import get_crystal_computer_system
+        
+        broadcaster = get_crystal_computer_system().get_activity_stream()
+        cursor = broadcaster.start_cursor(
+            request.headers.get("Last-Event-ID") or request.args.get("last_event_id"),
+            request.args.get("backlog", 0, type=int)
+        )
+        return Response(iter_sse(broadcaster, cursor), headers=SSE_HEADERS[1:],
+                        mimetype="text/event-stream")
 
 def initialize_production_crystal():
     """Initialize production Crystal Computer system"""
+    logging.basicConfig(level=logging.INFO)
     crystal = ProductionCrystalSystem()
     logging.info(f"Production Crystal Computer initialized for {crystal.owner}")
     logging.info(f"Features: {crystal.system_specs['crystal_features']:,}+")
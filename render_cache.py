@@ -0,0 +1,185 @@
+"""
+Render Cache - Precompressed Page Cache for Crystal Computer Interfaces
+Copyright © 2025 Ervin Remus Radosavlevici
+Official Owner: Ervin Remus Radosavlevici
+Contact: radosavlevici210@icloud.com
+Stores rendered pages as bytes with gzip/brotli variants and strong ETags
+"""
+
+import gzip
+import json
+import hashlib
+import threading
+from typing import Any, Callable, Dict, Iterable, Optional
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip is always available
+    brotli = None
+
+# Encodings in server preference order when the client weights them equally
+PREFERRED_ENCODINGS = ("br", "gzip", "identity")
+
+
+def fingerprint(*inputs: Any) -> str:
+    """Hash render inputs into a stable cache key"""
+    payload = json.dumps(inputs, sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def parse_accept_encoding(header: Optional[str]) -> Dict[str, float]:
+    """Parse an Accept-Encoding header into {coding: q-value}"""
+    weights = {}
+    if not header:
+        return weights
+
+    for item in header.split(","):
+        parts = item.strip().split(";")
+        coding = parts[0].strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        for param in parts[1:]:
+            name, _, value = param.strip().partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        weights[coding] = q
+
+    return weights
+
+
+def etag_for_key(key: str) -> str:
+    """Opaque ETag value derived from a render key"""
+    return key[:32]
+
+
+class RenderedPage:
+    """A rendered page with its precompressed variants and ETag"""
+
+    __slots__ = ("key", "etag", "content_type", "variants")
+
+    def __init__(self, key: str, body: bytes, content_type: str = "text/html; charset=utf-8"):
+        self.key = key
+        self.etag = etag_for_key(key)
+        self.content_type = content_type
+        self.variants = {"identity": body}
+        self.variants["gzip"] = gzip.compress(body, compresslevel=9, mtime=0)
+        if brotli is not None:
+            self.variants["br"] = brotli.compress(body, quality=11)
+
+    def etag_for(self, encoding: str) -> str:
+        """Strong ETag for one encoding of the page"""
+        if encoding == "identity":
+            return f'"{self.etag}"'
+        return f'"{self.etag}-{encoding}"'
+
+    def all_etags(self):
+        """ETags of every stored variant"""
+        return [self.etag_for(encoding) for encoding in self.variants]
+
+    def choose_encoding(self, accept_encoding: Optional[str]) -> str:
+        """Pick the best stored variant for an Accept-Encoding header"""
+        weights = parse_accept_encoding(accept_encoding)
+        wildcard = weights.get("*")
+
+        best, best_q = "identity", 0.0
+        for encoding in PREFERRED_ENCODINGS:
+            if encoding not in self.variants:
+                continue
+            q = weights.get(encoding, wildcard if wildcard is not None else 0.0)
+            if encoding == "identity" and encoding not in weights and wildcard is None:
+                q = 0.001  # identity is acceptable unless explicitly refused
+            if q > best_q:
+                best, best_q = encoding, q
+
+        return best
+
+    def matches(self, if_none_match: Optional[str]) -> bool:
+        """Check an If-None-Match header against any stored variant"""
+        return etag_matches(if_none_match, self.all_etags())
+
+
+def etag_matches(if_none_match: Optional[str], etags: Iterable[str]) -> bool:
+    """Check an If-None-Match header against a set of quoted ETags"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+
+    candidates = set()
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        candidates.add(tag[2:] if tag.startswith("W/") else tag)
+    return any(etag in candidates for etag in etags)
+
+
+class RenderCache:
+    """Thread-safe cache of rendered pages keyed by a hash of their inputs"""
+
+    def __init__(self, max_entries: int = 8):
+        self.max_entries = max_entries
+        self._pages: Dict[str, RenderedPage] = {}
+        self._lock = threading.Lock()
+
+    def get_or_render(self, key: str, render: Callable[[], str]) -> RenderedPage:
+        """Return the cached page for key, rendering it on a miss"""
+        page = self._pages.get(key)
+        if page is not None:
+            return page
+
+        with self._lock:
+            page = self._pages.get(key)
+            if page is None:
+                page = RenderedPage(key, render().encode("utf-8"))
+                if len(self._pages) >= self.max_entries:
+                    self._pages.pop(next(iter(self._pages)))
+                self._pages[key] = page
+        return page
+
+    def clear(self):
+        """Drop every cached page"""
+        with self._lock:
+            self._pages.clear()
+
+
+def make_cached_response(page: RenderedPage, request):
+    """Build a Flask response for a cached page, honouring conditional GETs"""
+    from flask import Response
+
+    encoding = page.choose_encoding(request.headers.get("Accept-Encoding"))
+    headers = {
+        "ETag": page.etag_for(encoding),
+        "Vary": "Accept-Encoding",
+    }
+
+    if page.matches(request.headers.get("If-None-Match")):
+        return Response(status=304, headers=headers)
+
+    if encoding != "identity":
+        headers["Content-Encoding"] = encoding
+
+    return Response(page.variants[encoding], content_type=page.content_type, headers=headers)
+
+
+def make_streaming_response(key: str, chunks: Callable[[], Iterable[str]], request):
+    """Build a chunked Flask response for an uncached page render
+
+    The ETag comes from the render key, so a matching If-None-Match is
+    answered with 304 before any chunk is produced.
+    """
+    from flask import Response, stream_with_context
+
+    etag = f'"{etag_for_key(key)}"'
+    headers = {"ETag": etag}
+
+    if etag_matches(request.headers.get("If-None-Match"), [etag]):
+        return Response(status=304, headers=headers)
+
+    return Response(
+        stream_with_context(chunks()),
+        content_type="text/html; charset=utf-8",
+        headers=headers
+    )
@@ -0,0 +1,200 @@
+"""
+Crystal Scheduler - Shared Periodic Task Scheduler
+Copyright © 2025 Ervin Remus Radosavlevici
+Official Owner: Ervin Remus Radosavlevici
+Contact: radosavlevici210@icloud.com
+Runs periodic tasks for any number of systems on a single thread
+"""
+
+import os
+import time
+import heapq
+import atexit
+import random
+import logging
+import itertools
+import threading
+from typing import Callable, List, Optional
+
+
+class ScheduledTask:
+    """Handle for a periodic task; cancel() stops it immediately"""
+
+    __slots__ = ("callback", "interval", "jitter", "cancelled", "_scheduler")
+
+    def __init__(self, scheduler: "PeriodicScheduler", callback: Callable[[], None],
+                 interval: float, jitter: float):
+        self.callback = callback
+        self.interval = interval
+        self.jitter = jitter
+        self.cancelled = False
+        self._scheduler = scheduler
+
+    def cancel(self):
+        """Stop the task; it will not run again once this returns"""
+        self._scheduler.cancel(self)
+
+    def next_delay(self) -> float:
+        """Interval until the next run, plus up to jitter seconds"""
+        return self.interval + (random.uniform(0, self.jitter) if self.jitter else 0.0)
+
+
+class PeriodicScheduler:
+    """Heap of periodic tasks served by one worker thread
+
+    Callbacks run on the worker thread and should return quickly; a slow
+    callback delays every other task. Exceptions are logged and the task
+    keeps its schedule.
+    """
+
+    def __init__(self, name: str = "crystal-scheduler", clock: Callable[[], float] = time.monotonic):
+        self.name = name
+        self._clock = clock
+        self._heap: List = []  # (due time, sequence, task)
+        self._sequence = itertools.count()
+        self._condition = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._running: Optional[ScheduledTask] = None
+        self._cancelled = 0
+        self._stopped = False
+
+    def schedule(self, callback: Callable[[], None], interval: float, jitter: float = 0.0,
+                 initial_delay: Optional[float] = None) -> ScheduledTask:
+        """Run callback every interval seconds until cancelled
+
+        The first run happens after initial_delay, or after one jittered
+        interval when initial_delay is None.
+        """
+        if interval <= 0:
+            raise ValueError("interval must be positive")
+        if jitter < 0:
+            raise ValueError("jitter must not be negative")
+
+        task = ScheduledTask(self, callback, interval, jitter)
+        delay = task.next_delay() if initial_delay is None else initial_delay
+        with self._condition:
+            if self._stopped:
+                raise RuntimeError("scheduler has been shut down")
+            heapq.heappush(self._heap, (self._clock() + delay, next(self._sequence), task))
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+                self._thread.start()
+            self._condition.notify()
+        return task
+
+    def cancel(self, task: ScheduledTask):
+        """Cancel a task, waiting for it to finish if it is running right now"""
+        with self._condition:
+            if task.cancelled:
+                return
+            task.cancelled = True
+            # A running task is out of the heap and will not be requeued, so
+            # only queued entries count towards the dead-entry total
+            if self._running is not task:
+                self._cancelled += 1
+            # Drop dead entries once they make up most of the heap
+            if self._cancelled > 64 and self._cancelled * 2 > len(self._heap):
+                self._heap = [item for item in self._heap if not item[2].cancelled]
+                heapq.heapify(self._heap)
+                self._cancelled = 0
+            self._condition.notify_all()
+            if threading.current_thread() is not self._thread:
+                while self._running is task:
+                    self._condition.wait()
+
+    def shutdown(self, wait: bool = True, timeout: Optional[float] = None):
+        """Cancel every task and stop the worker thread"""
+        with self._condition:
+            self._stopped = True
+            for _, _, task in self._heap:
+                task.cancelled = True
+            self._heap = []
+            self._condition.notify_all()
+            thread = self._thread
+        if wait and thread is not None and thread is not threading.current_thread():
+            thread.join(timeout)
+
+    def _restart_after_fork(self):
+        """Recreate the worker thread in a forked child, keeping its tasks"""
+        self._condition = threading.Condition()
+        self._running = None
+        self._thread = None
+        if self._heap and not self._stopped:
+            self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+            self._thread.start()
+
+    def __len__(self) -> int:
+        with self._condition:
+            return sum(1 for item in self._heap if not item[2].cancelled)
+
+    def _run(self):
+        """Worker loop: sleep until the earliest task is due, then run it"""
+        condition = self._condition
+        with condition:
+            while not self._stopped:
+                while self._heap and self._heap[0][2].cancelled:
+                    heapq.heappop(self._heap)
+                    self._cancelled = max(self._cancelled - 1, 0)
+                if not self._heap:
+                    condition.wait()
+                    continue
+
+                due, _, task = self._heap[0]
+                delay = due - self._clock()
+                if delay > 0:
+                    condition.wait(delay)
+                    continue
+
+                heapq.heappop(self._heap)
+                self._running = task
+                condition.release()
+                try:
+                    task.callback()
+                except Exception:
+                    logging.exception("Scheduled task %r failed", task.callback)
+                finally:
+                    condition.acquire()
+                    self._running = None
+                    condition.notify_all()
+
+                if not task.cancelled and not self._stopped:
+                    # Skip missed runs rather than firing a burst to catch up
+                    next_due = max(due + task.next_delay(), self._clock())
+                    heapq.heappush(self._heap, (next_due, next(self._sequence), task))
+
+
+_scheduler = None
+_scheduler_lock = threading.Lock()
+_hooks_registered = False
+
+
+def get_scheduler() -> PeriodicScheduler:
+    """Get the process-wide scheduler, starting a new one after shutdown"""
+    global _scheduler, _hooks_registered
+    with _scheduler_lock:
+        if _scheduler is None or _scheduler._stopped:
+            _scheduler = PeriodicScheduler()
+        if not _hooks_registered:
+            _hooks_registered = True
+            atexit.register(shutdown_scheduler, True, 5.0)
+            # Pre-forking servers (gunicorn --preload) fork after tasks exist
+            if hasattr(os, "register_at_fork"):
+                os.register_at_fork(after_in_child=_restart_scheduler_after_fork)
+        return _scheduler
+
+
+def shutdown_scheduler(wait: bool = True, timeout: Optional[float] = None):
+    """Shut down the process-wide scheduler; get_scheduler() then makes a new one"""
+    global _scheduler
+    with _scheduler_lock:
+        scheduler, _scheduler = _scheduler, None
+    if scheduler is not None:
+        scheduler.shutdown(wait, timeout)
+
+
+def _restart_scheduler_after_fork():
+    global _scheduler_lock
+    # The parent may have held the lock at fork time
+    _scheduler_lock = threading.Lock()
+    if _scheduler is not None:
+        _scheduler._restart_after_fork()
@@ -0,0 +1,261 @@
+"""
+Crystal Shared State - Cross-Process Status and Activity Ring
+Copyright © 2025 Ervin Remus Radosavlevici
+Official Owner: Ervin Remus Radosavlevici
+Contact: radosavlevici210@icloud.com
+Memory-mapped state file shared by every worker process on a host
+
+Layout: a fixed header, a length-prefixed JSON status region, then a ring
+of fixed-size activity slots of <uint64 sequence><float64 epoch>
+<uint16 length><utf-8 message>. Writers hold an exclusive flock on the
+file, readers a shared one. A separate .leader lock file elects the one
+process that runs periodic monitoring.
+
+The status region is a small JSON document for fields that really differ
+between workers; CrystalComputerSystem keeps system_timestamp and
+monitor_pid there and leaves its constant fields per process.
+"""
+
+import os
+import json
+import mmap
+import fcntl
+import struct
+import weakref
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+MAGIC = b"CRSS"
+VERSION = 1
+HEADER = struct.Struct("<4sHHIIQ")  # magic, version, reserved, slots, slot size, next sequence
+HEADER_BYTES = 64
+STATUS_BYTES = 4096
+STATUS_LENGTH = struct.Struct("<I")
+SLOT_HEADER = struct.Struct("<QdH")
+
+
+class SharedState:
+    """Status fields and an activity ring shared between processes"""
+
+    def __init__(self, path: str, slots: int = 1000, slot_size: int = 256):
+        if slot_size <= SLOT_HEADER.size:
+            raise ValueError("slot_size too small")
+        self.path = path
+        self.slots = slots
+        self.slot_size = slot_size
+        self.size = HEADER_BYTES + STATUS_BYTES + slots * slot_size
+        self._lock = threading.Lock()
+        self._pid = None
+        self._fd = None
+        self._map = None
+        self._leader_fd = None
+        self._open()
+        _instances.add(self)
+
+    def _open(self):
+        """(Re)open the state file; called again after a fork"""
+        self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        self._pid = os.getpid()
+        fcntl.flock(self._fd, fcntl.LOCK_EX)
+        try:
+            existing = os.fstat(self._fd).st_size
+            if existing == 0:
+                os.ftruncate(self._fd, self.size)
+            elif existing != self.size:
+                raise ValueError(f"{self.path} has a different shared state layout")
+            self._map = mmap.mmap(self._fd, self.size)
+            magic, version, _, slots, slot_size, _ = HEADER.unpack_from(self._map, 0)
+            if existing == 0:
+                HEADER.pack_into(self._map, 0, MAGIC, VERSION, 0, self.slots, self.slot_size, 0)
+                STATUS_LENGTH.pack_into(self._map, HEADER_BYTES, 0)
+            elif (magic, version, slots, slot_size) != (MAGIC, VERSION, self.slots, self.slot_size):
+                raise ValueError(f"{self.path} has a different shared state layout")
+        finally:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+    def _reopen_after_fork(self):
+        """Drop descriptors inherited from the parent and open our own
+
+        Inherited descriptors share the parent's flocks, so they would not
+        exclude the parent or sibling workers.
+        """
+        self._lock = threading.Lock()
+        self._map.close()
+        os.close(self._fd)
+        if self._leader_fd is not None:
+            os.close(self._leader_fd)
+            self._leader_fd = None
+        self._open()
+
+    def _locked(self, operation: int):
+        """Context manager holding the thread lock and a file lock"""
+        if self._pid != os.getpid():
+            self._reopen_after_fork()
+        return _FileLock(self._lock, self._fd, operation)
+
+    @property
+    def sequence(self) -> int:
+        """Total number of activity records ever appended"""
+        with self._locked(fcntl.LOCK_SH):
+            return HEADER.unpack_from(self._map, 0)[5]
+
+    def append_many(self, records: Iterable[Tuple[float, str]]):
+        """Append (epoch, message) records to the shared ring"""
+        capacity = self.slot_size - SLOT_HEADER.size
+        encoded = [(ts, message.encode("utf-8")[:capacity]) for ts, message in records]
+        if not encoded:
+            return
+        with self._locked(fcntl.LOCK_EX):
+            data = self._map
+            sequence = HEADER.unpack_from(data, 0)[5]
+            for ts, body in encoded:
+                offset = self._slot_offset(sequence)
+                SLOT_HEADER.pack_into(data, offset, sequence, ts, len(body))
+                start = offset + SLOT_HEADER.size
+                data[start:start + len(body)] = body
+                sequence += 1
+            struct.pack_into("<Q", data, 16, sequence)
+
+    def tail(self, limit: Optional[int] = None, after: Optional[int] = None) -> List[Tuple[int, float, str]]:
+        """Most recent (sequence, epoch, message) records, oldest first
+
+        With after set only records with a larger sequence are returned.
+        """
+        with self._locked(fcntl.LOCK_SH):
+            data = self._map
+            end = HEADER.unpack_from(data, 0)[5]
+            start = max(0, end - self.slots)
+            if after is not None:
+                start = max(start, after + 1)
+            if limit is not None:
+                start = max(start, end - limit)
+
+            records = []
+            for sequence in range(start, end):
+                offset = self._slot_offset(sequence)
+                stored, ts, length = SLOT_HEADER.unpack_from(data, offset)
+                body = offset + SLOT_HEADER.size
+                records.append((stored, ts, data[body:body + length].decode("utf-8", "ignore")))
+            return records
+
+    def get_status(self) -> Dict[str, Any]:
+        """Shared status fields"""
+        with self._locked(fcntl.LOCK_SH):
+            return self._read_status()
+
+    def update_status(self, **fields: Any) -> Dict[str, Any]:
+        """Merge fields into the shared status and return the result"""
+        with self._locked(fcntl.LOCK_EX):
+            status = self._read_status()
+            status.update(fields)
+            self._write_status(status)
+            return status
+
+    def setdefault_status(self, **fields: Any) -> Dict[str, Any]:
+        """Set fields that are not yet present; return the full status"""
+        with self._locked(fcntl.LOCK_EX):
+            status = self._read_status()
+            missing = {key: value for key, value in fields.items() if key not in status}
+            if missing:
+                status.update(missing)
+                self._write_status(status)
+            return status
+
+    def try_lead(self) -> bool:
+        """Become (or stay) the leader process without blocking
+
+        Leadership is an exclusive lock on the .leader file, so it passes to
+        another process as soon as the leader exits.
+        """
+        with self._locked(fcntl.LOCK_SH):
+            if self._leader_fd is not None:
+                return True
+            fd = os.open(self.path + ".leader", os.O_RDWR | os.O_CREAT, 0o600)
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                os.close(fd)
+                return False
+            self._leader_fd = fd
+            return True
+
+    def resign(self):
+        """Give up leadership if held"""
+        with self._lock:
+            if self._leader_fd is not None and self._pid == os.getpid():
+                os.close(self._leader_fd)
+            self._leader_fd = None
+
+    @property
+    def is_leader(self) -> bool:
+        return self._leader_fd is not None and self._pid == os.getpid()
+
+    def close(self):
+        """Release leadership and unmap the file"""
+        self.resign()
+        with self._lock:
+            if self._map is not None:
+                self._map.close()
+                os.close(self._fd)
+                self._map = None
+
+    def _slot_offset(self, sequence: int) -> int:
+        return HEADER_BYTES + STATUS_BYTES + (sequence % self.slots) * self.slot_size
+
+    def _read_status(self) -> Dict[str, Any]:
+        length = STATUS_LENGTH.unpack_from(self._map, HEADER_BYTES)[0]
+        if not length:
+            return {}
+        start = HEADER_BYTES + STATUS_LENGTH.size
+        return json.loads(self._map[start:start + length])
+
+    def _write_status(self, status: Dict[str, Any]):
+        body = json.dumps(status, sort_keys=True, separators=(",", ":")).encode("utf-8")
+        if len(body) > STATUS_BYTES - STATUS_LENGTH.size:
+            raise ValueError("shared status does not fit in the status region")
+        start = HEADER_BYTES + STATUS_LENGTH.size
+        self._map[start:start + len(body)] = body
+        STATUS_LENGTH.pack_into(self._map, HEADER_BYTES, len(body))
+
+
+_instances = weakref.WeakSet()
+
+
+def _reset_locks_after_fork():
+    """Give each instance a fresh thread lock in a forked child
+
+    Another parent thread may have held the lock at fork time; that thread
+    does not exist in the child, so the inherited lock would never be
+    released. Descriptors are reopened lazily on first use.
+    """
+    for state in list(_instances):
+        state._lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_locks_after_fork)
+
+
+class _FileLock:
+    """Thread lock plus flock, released in reverse order"""
+
+    __slots__ = ("_lock", "_fd", "_operation")
+
+    def __init__(self, lock: threading.Lock, fd: int, operation: int):
+        self._lock = lock
+        self._fd = fd
+        self._operation = operation
+
+    def __enter__(self):
+        self._lock.acquire()
+        try:
+            fcntl.flock(self._fd, self._operation)
+        except BaseException:
+            self._lock.release()
+            raise
+
+    def __exit__(self, *exc_info):
+        try:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+        finally:
+            self._lock.release()
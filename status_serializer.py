@@ -0,0 +1,128 @@
+"""
+Status Serializer - Pre-encoded JSON for Crystal Status Endpoints
+Copyright © 2025 Ervin Remus Radosavlevici
+Official Owner: Ervin Remus Radosavlevici
+Contact: radosavlevici210@icloud.com
+Encodes the static part of a status payload once and splices in the
+fields that change per request
+"""
+
+import copy
+import json
+from functools import partial
+from typing import Any, Dict, Iterable, List, Tuple
+
+
+def dumps(obj: Any) -> bytes:
+    """Compact, key-sorted JSON bytes using the fastest available backend"""
+    return _dumps(obj)
+
+
+def _stdlib_dumps(obj: Any) -> bytes:
+    return json.dumps(obj, sort_keys=True, separators=(",", ":")).encode("utf-8")
+
+
+def _select_backend(obj: Any) -> bytes:
+    """Pick the encoder on first use; importing orjson costs several ms"""
+    global _dumps
+    try:
+        import orjson
+    except ImportError:  # orjson is optional; the stdlib encoder is the fallback
+        _dumps = _stdlib_dumps
+    else:
+        _dumps = partial(orjson.dumps, option=orjson.OPT_SORT_KEYS)
+    return _dumps(obj)
+
+
+_dumps = _select_backend
+
+
+class FrozenDict(dict):
+    """dict that rejects mutation, so a cached payload can be shared safely
+
+    Being a real dict it still serializes with json, orjson and jsonify.
+    """
+
+    __slots__ = ()
+
+    def _readonly(self, *args, **kwargs):
+        raise TypeError(f"{type(self).__name__} is read-only")
+
+    __setitem__ = __delitem__ = __ior__ = _readonly
+    clear = pop = popitem = setdefault = update = _readonly
+
+    def __copy__(self) -> Dict[str, Any]:
+        return dict(self)
+
+    def __deepcopy__(self, memo) -> Dict[str, Any]:
+        return copy.deepcopy(dict(self), memo)
+
+    def __reduce__(self):
+        return (type(self), (dict(self),))
+
+
+def embed_field(body: bytes, name: str, fragment: bytes) -> bytes:
+    """Append a pre-encoded field to an encoded JSON object"""
+    head = body.rstrip()
+    if not head.endswith(b"}"):
+        raise ValueError("body is not an encoded JSON object")
+    separator = b"" if head[:-1].rstrip() == b"{" else b","
+    return head[:-1] + separator + dumps(name) + b":" + fragment + b"}"
+
+
+class PreencodedStatus:
+    """JSON object whose static fields are encoded only when they change
+
+    Output is byte-for-byte what dumps() gives for the merged object: keys
+    stay sorted, with each dynamic field spliced in at its sorted position.
+    """
+
+    def __init__(self, dynamic_fields: Iterable[str] = ("timestamp",)):
+        self.dynamic_fields = tuple(dynamic_fields)
+        self._source = None  # (static object, version) last encoded
+        self._template: List[bytes] = []
+        self._slots: List[Tuple[int, str]] = []  # (template index, dynamic field)
+
+    def encode(self, static: Dict[str, Any], version: Any = None, **dynamic: Any) -> bytes:
+        """Encode a status object from its static part and dynamic fields
+
+        With version given, the static part is re-encoded only when version
+        changes; otherwise only when a different static object is passed.
+        Changes made to static in place need a new version to be picked up.
+        """
+        source = self._source
+        key = static if version is None else None
+        if source is None or source[0] is not key or source[1] != version:
+            self._rebuild(key, static, version)
+
+        parts = list(self._template)
+        for index, name in self._slots:
+            parts[index] = dumps(dynamic[name])
+        return b"".join(parts)
+
+    def _rebuild(self, key: Any, static: Dict[str, Any], version: Any):
+        """Encode the static fields around placeholders for the dynamic ones"""
+        dynamic = set(self.dynamic_fields)
+        template: List[bytes] = []
+        slots: List[Tuple[int, str]] = []
+        literal = b"{"
+        for position, name in enumerate(sorted(set(static) | dynamic)):
+            literal += (b"," if position else b"") + dumps(name) + b":"
+            if name in dynamic:
+                template.append(literal)
+                slots.append((len(template), name))
+                template.append(b"")
+                literal = b""
+            else:
+                literal += dumps(static[name])
+        template.append(literal + b"}\n")
+        self._template = template
+        self._slots = slots
+        self._source = (key, version)
+
+
+def json_response(body: bytes):
+    """Wrap pre-encoded JSON bytes in a Flask response"""
+    from flask import Response
+
+    return Response(body, mimetype="application/json")
@@ -0,0 +1,241 @@
+"""
+Threat Matcher - Multi-Pattern Threat Signature Matching
+Copyright © 2025 Ervin Remus Radosavlevici
+Official Owner: Ervin Remus Radosavlevici
+Contact: radosavlevici210@icloud.com
+Aho-Corasick automaton that finds every threat signature in one linear
+pass over the input, independent of the number of signatures, and a
+streaming scanner for files and chunked sources of any size
+"""
+
+import os
+from collections import deque
+from typing import Any, Dict, Iterable, Iterator, List, Sequence, Set, Tuple, Union
+
+# Severity and response for each signature set in threat_signatures
+THREAT_CATEGORIES = {
+    "suspicious_patterns": {
+        "severity": "HIGH",
+        "recommended_action": "Immediate investigation required"
+    },
+    "scammer_indicators": {
+        "severity": "CRITICAL",
+        "recommended_action": "Block and report immediately"
+    }
+}
+
+DEFAULT_CHUNK_SIZE = 1 << 20
+
+# Below this many signatures, C-level substring scans of the lowercased
+# text beat the Python automaton loop (crossover measured near 350)
+AUTOMATON_MIN_SIGNATURES = 384
+
+
+class AhoCorasick:
+    """Automaton over lowercase patterns reporting which patterns occur
+
+    Patterns and texts may be str or bytes, as long as both are the same.
+    """
+
+    def __init__(self, patterns: Sequence[Union[str, bytes]]):
+        self.patterns = list(patterns)
+        goto: List[Dict[str, int]] = [{}]
+        outputs: List[Tuple[int, ...]] = [()]
+
+        # An empty pattern occurs in every text, as with the in operator
+        self._always = {index for index, pattern in enumerate(self.patterns) if not pattern}
+        for index, pattern in enumerate(self.patterns):
+            if not pattern:
+                continue
+            state = 0
+            for char in pattern:
+                next_state = goto[state].get(char)
+                if next_state is None:
+                    next_state = len(goto)
+                    goto[state][char] = next_state
+                    goto.append({})
+                    outputs.append(())
+                state = next_state
+            outputs[state] += (index,)
+
+        # Breadth-first failure links; each state inherits its fallback's outputs
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, child in goto[state].items():
+                queue.append(child)
+                fallback = fail[state]
+                while fallback and char not in goto[fallback]:
+                    fallback = fail[fallback]
+                target = goto[fallback].get(char, 0)
+                fail[child] = target if target != child else 0
+                outputs[child] += outputs[fail[child]]
+
+        self._goto = goto
+        self._fail = fail
+        self._outputs = outputs
+
+    def __len__(self) -> int:
+        return len(self.patterns)
+
+    def find(self, text: str) -> Set[int]:
+        """Indices of the patterns occurring in text (already lowercased)"""
+        goto = self._goto
+        fail = self._fail
+        outputs = self._outputs
+        root = goto[0]
+        found: Set[int] = set(self._always)
+        if len(found) == len(self.patterns):
+            return found
+        state = 0
+
+        for char in text:
+            next_state = goto[state].get(char)
+            while next_state is None:
+                if not state:
+                    next_state = root.get(char, 0)
+                    break
+                state = fail[state]
+                next_state = goto[state].get(char)
+            state = next_state
+            if outputs[state]:
+                found.update(outputs[state])
+                if len(found) == len(self.patterns):
+                    break
+        return found
+
+    def feed(self, data: Union[str, bytes], state: int = 0) -> Tuple[List[Tuple[int, int]], int]:
+        """(end index, pattern index) matches in data and the state to resume from
+
+        Passing the returned state with the next chunk continues the scan as
+        if the chunks were one text, so matches spanning chunks are found.
+        """
+        goto = self._goto
+        fail = self._fail
+        outputs = self._outputs
+        root = goto[0]
+        matches = []
+
+        for position, symbol in enumerate(data):
+            next_state = goto[state].get(symbol)
+            while next_state is None:
+                if not state:
+                    next_state = root.get(symbol, 0)
+                    break
+                state = fail[state]
+                next_state = goto[state].get(symbol)
+            state = next_state
+            for index in outputs[state]:
+                matches.append((position, index))
+        return matches, state
+
+
+class ThreatMatcher:
+    """Compiled form of a threat_signatures mapping
+
+    Small signature sets are matched with one substring scan per
+    signature; larger ones with a single Aho-Corasick pass.
+    """
+
+    def __init__(self, threat_signatures: Dict[str, Sequence[str]]):
+        self.entries: List[Tuple[str, str]] = [
+            (category, signature)
+            for category in THREAT_CATEGORIES
+            for signature in threat_signatures.get(category, ())
+        ]
+        self.key = self.signature_key(threat_signatures)
+        self.lowered = [signature.lower() for _, signature in self.entries]
+        self.automaton = AhoCorasick(self.lowered) if len(self.lowered) >= AUTOMATON_MIN_SIGNATURES else None
+        self._byte_automaton = None
+
+    @staticmethod
+    def signature_key(threat_signatures: Dict[str, Sequence[str]]) -> Tuple:
+        """Value that changes whenever the signature sets change"""
+        return tuple(tuple(threat_signatures.get(category, ())) for category in THREAT_CATEGORIES)
+
+    def match(self, text: str) -> List[Tuple[str, str]]:
+        """(category, signature) pairs found in text, in signature order"""
+        text = text.lower()
+        if self.automaton is None:
+            return [entry for entry, signature in zip(self.entries, self.lowered) if signature in text]
+        return [self.entries[index] for index in sorted(self.automaton.find(text))]
+
+    def scan_stream(self, source: Any, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[Dict[str, Any]]:
+        """Yield a detection for every signature occurrence in source
+
+        source is a file path, a binary or text file object, or an iterable
+        of bytes/str chunks. Matching is ASCII case-insensitive on the UTF-8
+        bytes and offsets are byte offsets into that stream. Memory stays
+        bounded by chunk_size however large the source is.
+        """
+        signatures = [signature.encode("utf-8") for signature in self.lowered]
+        chunks = _iter_chunks(source, chunk_size)
+        if len(signatures) >= AUTOMATON_MIN_SIGNATURES:
+            matches = self._scan_automaton(signatures, chunks)
+        else:
+            matches = self._scan_substrings(signatures, chunks)
+
+        for offset, index in matches:
+            category, signature = self.entries[index]
+            yield {
+                "threat_type": signature,
+                "category": category,
+                "severity": THREAT_CATEGORIES[category]["severity"],
+                "recommended_action": THREAT_CATEGORIES[category]["recommended_action"],
+                "offset": offset
+            }
+
+    def _scan_automaton(self, signatures: List[bytes], chunks: Iterable[bytes]) -> Iterator[Tuple[int, int]]:
+        """Byte automaton whose state carries over between chunks"""
+        if self._byte_automaton is None:
+            self._byte_automaton = AhoCorasick(signatures)
+        automaton = self._byte_automaton
+        base = 0
+        state = 0
+        for chunk in chunks:
+            matches, state = automaton.feed(chunk, state)
+            for end, index in matches:
+                yield base + end - len(signatures[index]) + 1, index
+            base += len(chunk)
+
+    def _scan_substrings(self, signatures: List[bytes], chunks: Iterable[bytes]) -> Iterator[Tuple[int, int]]:
+        """Per-signature find() over each chunk plus the previous chunk's tail"""
+        overlap = max((len(signature) for signature in signatures), default=1) - 1
+        tail = b""
+        base = 0
+        for chunk in chunks:
+            window = tail + chunk
+            window_base = base - len(tail)
+            matches = []
+            for index, signature in enumerate(signatures):
+                if not signature:
+                    continue
+                position = window.find(signature)
+                while position != -1:
+                    # Matches lying wholly inside the tail were reported already
+                    if position + len(signature) > len(tail):
+                        matches.append((window_base + position, index))
+                    position = window.find(signature, position + 1)
+            matches.sort()
+            yield from matches
+            base += len(chunk)
+            tail = window[-overlap:] if overlap else b""
+
+
+def _iter_chunks(source: Any, chunk_size: int) -> Iterator[bytes]:
+    """Lowercased UTF-8 chunks from a path, file object or chunk iterable"""
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, "rb") as f:
+            yield from _iter_chunks(f, chunk_size)
+        return
+
+    if hasattr(source, "read"):
+        read = source.read
+        source = iter(lambda: read(chunk_size), source.read(0))
+
+    for chunk in source:
+        if isinstance(chunk, str):
+            chunk = chunk.encode("utf-8")
+        if chunk:
+            yield chunk.lower()
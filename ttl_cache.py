@@ -0,0 +1,109 @@
+"""
+TTL Cache with Stale-While-Revalidate
+Copyright © 2025 Ervin Remus Radosavlevici
+Official Owner: Ervin Remus Radosavlevici
+Contact: radosavlevici210@icloud.com
+Keeps an expensive value off the request path with a single background refresh
+"""
+
+import time
+import logging
+import threading
+from typing import Any, Callable, Optional, Tuple
+
+
+class StaleWhileRevalidateCache:
+    """Cache one computed value with a TTL and background revalidation
+
+    Fresh values are returned directly. Once the TTL passes, the first reader
+    starts a single background refresh and every reader keeps receiving the
+    previous value until it completes. Only the very first load, or a value
+    older than ttl + max_stale, is computed on the caller's thread.
+
+    Each stored value gets a version: a per-process counter by default, or
+    version_key(value) when given. Use a content digest as version_key when
+    the version must agree across processes, e.g. as an HTTP ETag.
+    """
+
+    def __init__(self, loader: Callable[[], Any], ttl: float, max_stale: Optional[float] = None,
+                 clock: Callable[[], float] = time.monotonic,
+                 version_key: Optional[Callable[[Any], Any]] = None):
+        self.loader = loader
+        self.ttl = ttl
+        self.max_stale = max_stale
+        self.clock = clock
+        self.version_key = version_key
+        self._entry = None  # (value, expires_at, version)
+        self._refreshing = False
+        self.version = 0  # bumped whenever a newly loaded value is stored
+        self._lock = threading.Lock()
+
+    def get(self) -> Any:
+        """Return the cached value, scheduling a refresh when it is stale"""
+        return self.get_with_version()[0]
+
+    def get_with_version(self) -> Tuple[Any, Any]:
+        """Return the cached value and the version it was stored under
+
+        Behaves like get(); the pair is read atomically, so the version
+        always describes the returned value even while a refresh lands.
+        """
+        entry = self._entry
+        if entry is None:
+            return self._load_now()
+
+        value, expires_at, version = entry
+        now = self.clock()
+        if now < expires_at:
+            return value, version
+
+        if self.max_stale is not None and now >= expires_at + self.max_stale:
+            return self._load_now()
+
+        self._start_refresh()
+        return value, version
+
+    def invalidate(self):
+        """Forget the cached value so the next read loads it again"""
+        with self._lock:
+            self._entry = None
+
+    def _load_now(self) -> Tuple[Any, Any]:
+        """Load on the caller's thread, letting concurrent callers share the result"""
+        with self._lock:
+            entry = self._entry
+            if entry is not None and (self.max_stale is None or self.clock() < entry[1] + self.max_stale):
+                return entry[0], entry[2]
+            value = self.loader()
+            return self._store(value)
+
+    def _start_refresh(self):
+        """Start a background refresh unless one is already running"""
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+
+        threading.Thread(target=self._refresh, daemon=True).start()
+
+    def _refresh(self):
+        """Background refresh; on failure keep serving the stale value for another TTL"""
+        try:
+            value = self.loader()
+            with self._lock:
+                self._store(value)
+        except Exception:
+            logging.exception("Background cache refresh failed; serving stale value")
+            with self._lock:
+                if self._entry is not None:
+                    self._entry = (self._entry[0], self.clock() + self.ttl, self._entry[2])
+        finally:
+            with self._lock:
+                self._refreshing = False
+
+    def _store(self, value: Any) -> Tuple[Any, Any]:
+        """Store a newly loaded value under its version; call with the lock held"""
+        self.version += 1
+        version = self.version if self.version_key is None else self.version_key(value)
+        self._entry = (value, self.clock() + self.ttl, version)
+        return value, version
@@ -0,0 +1,16 @@
+"""
+WSGI Entry Point - Crystal Computer Web Applications
+Copyright © 2025 Ervin Remus Radosavlevici
+Contact: radosavlevici210@icloud.com
+ORCID: 0009-0000-9787-510X
+Serves the enhanced watermarker app together with the production routes
+
+    gunicorn wsgi:application
+"""
+
+from crystal_system_production import app
+from production_crystal_system import create_production_routes
+
+create_production_routes(app)
+
+application = app